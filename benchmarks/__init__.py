@@ -0,0 +1 @@
+# Offline benchmarks for the scraper's hot paths (run from the project root with python -m benchmarks.<name>)
@@ -0,0 +1,98 @@
+"""Label parity and throughput of classify.classify_product_type vs. the old per-rule loop.
+
+    python -m benchmarks.classify [--pages 2000] [--words 3000]
+
+The old implementation ran up to 12 uncompiled re.search calls over the whole
+title + URL + page text. The corpus mixes every rule keyword, overlapping
+phrases ("air-cooled chiller", "specification") and keyword-free pages, and
+every label must match before timings are reported. "tiered" scores the title
+and URL first and is reported for speed only (its labels may differ).
+"""
+import argparse
+import random
+import re
+import time
+
+from src.classify import classify_many, classify_product_type
+
+KEYWORDS = [
+    "rtu", "rooftop", "chiller", "air-cooled chiller", "air cooled chiller", "doas", "dedicated outdoor air",
+    "energy recovery", "erv", "hrv", "ahu", "vrf", "vrv", "mini-split", "mini split", "boiler", "water heater",
+    "pump", "circulator", "cooling tower", "evapco", "closed-circuit", "fan coil", "fcu", "ptac", "vtac",
+    "heat exchanger", "plate", "sondex", "vfd", "drive", "eaton", "filter", "iaq", "ion", "specification",
+    "version", "overdrive", "templates",
+]
+FILLER = ("unit cabinet series model cooling heating capacity airflow voltage weight size "
+          "warranty install quiet efficient compressor coil refrigerant field support").split()
+
+
+def legacy_classify(title: str, url: str, page_text: str) -> str:
+    t = f"{title} {url} {page_text}".lower()
+    rules = [
+        (r"rtu|rooftop", "rtu"),
+        (r"chiller|air[- ]cooled chiller", "chiller_air_cooled"),
+        (r"doas|dedicated outdoor air|energy recovery|erv|hrv|ahu", "ahu_doas"),
+        (r"vrf|vrv|mini[- ]split", "vrf_od"),
+        (r"boiler|water heater", "boiler"),
+        (r"pump|circulator", "pump"),
+        (r"cooling tower|evapco|closed[- ]circuit", "cooling_tower"),
+        (r"fan coil|fcu", "fcu"),
+        (r"ptac|vtac", "ptac"),
+        (r"heat exchanger|plate|sondex", "hx"),
+        (r"vfd|drive|eaton", "vfd"),
+        (r"filter|iaq|ion", "filter_iaq"),
+    ]
+    for pat, label in rules:
+        if re.search(pat, t):
+            return label
+    return "unknown"
+
+
+def corpus(pages: int, words: int, seed: int = 7):
+    rnd = random.Random(seed)
+    rows = []
+    for i in range(pages):
+        body = [rnd.choice(FILLER) for _ in range(words)]
+        for _ in range(rnd.randint(0, 4)):
+            body.insert(rnd.randrange(len(body) + 1), rnd.choice(KEYWORDS).upper() if rnd.random() < 0.3 else rnd.choice(KEYWORDS))
+        title = f"{rnd.choice(FILLER).title()} {rnd.choice(KEYWORDS + FILLER * 6)} {i}"
+        url = f"https://example.com/products/{rnd.choice(FILLER)}-{i}/"
+        if rnd.random() < 0.7:
+            # most real pages say "information" or "specification" somewhere, which hits the last rule
+            body.append("information")
+        rows.append((title, url, " ".join(body)))
+    return rows
+
+
+def _time(fn, rows) -> float:
+    t = time.perf_counter()
+    fn(rows)
+    return time.perf_counter() - t
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pages", type=int, default=2000)
+    ap.add_argument("--words", type=int, default=3000)
+    args = ap.parse_args()
+
+    rows = corpus(args.pages, args.words)
+    edge = [("", "", "air-cooled chiller"), ("Specification", "", "rooftop"), ("", "", "plate chiller"),
+            ("", "", ""), ("VERSION", "", ""), ("drive", "https://x/rtu", "")]
+    for title, url, text in edge + rows:
+        expected = legacy_classify(title, url, text)
+        got = classify_product_type(title, url, text)
+        assert got == expected, (title, url, text[:80], got, expected)
+    labels = classify_many(rows)
+    assert labels == [legacy_classify(*r) for r in rows]
+    print(f"parity: {len(rows) + len(edge)} pages, {len(set(labels))} distinct labels")
+
+    before = _time(lambda rs: [legacy_classify(*r) for r in rs], rows)
+    after = _time(classify_many, rows)
+    tiered = _time(lambda rs: classify_many(rs, tiered=True), rows)
+    for name, secs in (("before", before), ("compiled", after), ("tiered", tiered)):
+        print(f"{name:>9}: {len(rows) / secs:10.0f} pages/s  ({secs / len(rows) * 1e6:7.1f} us/page)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Products found per page loaded: best-first vs. BFS frontier on a synthetic site.
+
+    python -m benchmarks.frontier [--limit 50] [--products 400] [--noise 300]
+
+The site mimics a manufacturer catalog: the home page and every category page
+link to support, news and case-study pages whose URLs also contain "/product"
+(so the default selectors queue them), product lines link to detail pages with
+model-number anchors, and details link to PDFs and related products. Both
+frontiers run the crawl loop of `src.crawl` (dedup, max_depth, selectors,
+product = page with specs or spec PDFs) without network access.
+"""
+import argparse
+import random
+
+from src.frontier import Frontier, LinkScorer, PriorityFrontier
+from src.html_parser import PDF_WORDS, parse_page
+from src.utils import join_url
+
+BASE = "https://example.com"
+SELECTORS = ["a[href*='/product']", "a[href*='/products/']", "a[href$='.pdf']"]
+LINES = ["rooftop-units", "chillers", "air-handlers", "fan-coils", "boilers", "pumps", "vrf-systems", "ptac"]
+
+
+def _page(title: str, links, specs=None) -> str:
+    body = "".join(f'<a href="{href}">{text}</a>' for href, text in links)
+    if specs:
+        rows = "".join(f"<tr><td>{k}</td><td>{v}</td></tr>" for k, v in specs.items())
+        body += f"<h2>Specifications</h2><table>{rows}</table>"
+    return f"<html><title>{title}</title>{body}</html>"
+
+
+def build_site(products: int, noise: int, seed: int = 3):
+    rnd = random.Random(seed)
+    site = {}
+    noise_urls = [(f"/{rnd.choice(['product-support', 'products/news', 'products/case-studies', 'product-registration'])}/"
+                   f"item-{i}", f"Read more {i}") for i in range(noise)]
+    details = {line: [] for line in LINES}
+    for i in range(products):
+        line = LINES[i % len(LINES)]
+        model = f"{line[:2].upper()}-{100 + i}"
+        details[line].append((f"/products/{line}/{model.lower()}", model))
+
+    def some_noise(k):
+        return rnd.sample(noise_urls, min(k, len(noise_urls)))
+
+    lines = [(f"/products/{line}/", line.replace("-", " ").title()) for line in LINES]
+    site["/"] = _page("Home", some_noise(40) + lines)
+    for (href, _), line in zip(lines, LINES):
+        site[href] = _page(line, some_noise(25) + details[line])
+    for href, text in noise_urls:
+        site[href] = _page(text, some_noise(6))
+    for line in LINES:
+        for href, model in details[line]:
+            related = rnd.sample(details[line], min(3, len(details[line])))
+            site[href] = _page(model, related + [(f"/docs/{model}.pdf", "Submittal"), ("/", "Home")] + some_noise(4),
+                               {"Model": model, "Capacity": f"{rnd.randint(3, 50)} ton"})
+    return site
+
+
+def crawl(site, frontier, limit: int, max_depth: int = 3):
+    frontier.push(BASE + "/", 0)
+    pages = products = 0
+    while products < limit:
+        item = frontier.pop()
+        if item is None:
+            break
+        url, depth = item
+        html = site.get(url[len(BASE):])
+        if html is None or url.endswith(".pdf"):
+            # the crawler skips non-HTML responses before counting a page
+            frontier.record(url, False)
+            continue
+        pages += 1
+        page = parse_page(html, SELECTORS)
+        produced = bool(page.specs or page.pdf_links)
+        products += produced
+        frontier.record(url, produced)
+        if depth < max_depth:
+            anchors = dict(page.product_links)
+            for href in page.selected_links:
+                frontier.push(join_url(BASE, href), depth + 1, anchors.get(href, ""), produced)
+    return products, pages
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--limit", type=int, default=50)
+    ap.add_argument("--products", type=int, default=400)
+    ap.add_argument("--noise", type=int, default=300)
+    args = ap.parse_args()
+
+    site = build_site(args.products, args.noise)
+    runs = {
+        "bfs": Frontier(),
+        "best": PriorityFrontier(LinkScorer(SELECTORS, PDF_WORDS)),
+    }
+    for name, frontier in runs.items():
+        products, pages = crawl(site, frontier, args.limit)
+        print(f"{name:>5}: {products} products in {pages} page loads ({products / max(1, pages):.2f} products/page)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Parse time per page: the old BeautifulSoup passes vs. the single lxml pass.
+
+    python -m benchmarks.html_parse [--products 2000] [--tables 40] [--repeat 5]
+
+"before" reproduces what crawl.run did per page: one BeautifulSoup parse for the
+title and text, a second inside extract_links_and_specs (with a backward heading
+search per table) and a third pass selecting product links. "after" is
+html_parser.parse_page. Both must produce the same links, specs and PDF links.
+"""
+import argparse
+import statistics
+import time
+
+from bs4 import BeautifulSoup
+
+from src.html_parser import PDF_WORDS, SPEC_HEADERS_HINTS, parse_page
+
+SELECTORS = ["a[href*='/product']", "a[href*='/products/']", "a[href$='.pdf']"]
+
+
+def catalog_page(products: int, tables: int) -> str:
+    """A large catalog page: nav, product grid, spec tables under headings, PDF links."""
+    parts = ["<html><head><title>Rooftop Units | Example HVAC</title>",
+             "<script>window.dataLayer = [];</script><style>.x{color:red}</style></head><body>"]
+    parts.append("<nav>" + "".join(f'<a href="/about/{i}">About {i}</a>' for i in range(200)) + "</nav>")
+    parts.append("<h1>Rooftop Units</h1><ul>")
+    for i in range(products):
+        parts.append(f'<li><a href="/products/rtu-{i}/">RN Series {i}</a> <span>Model: RN-{i:04d}</span></li>')
+    parts.append("</ul>")
+    for t in range(tables):
+        heading = "Specifications" if t % 2 == 0 else "Accessories"
+        parts.append(f"<h2>{heading} {t}</h2><p>Notes for table {t}.</p><table>")
+        for r in range(25):
+            parts.append(f"<tr><td>Field {t}-{r}</td><td>{r * 1.5} ton</td></tr>")
+        parts.append("</table>")
+    for i in range(products // 10):
+        parts.append(f'<a href="/docs/rn-{i}-submittal.pdf">RN {i} Submittal</a>')
+    parts.append("</body></html>")
+    return "".join(parts)
+
+
+def legacy_parse(html: str):
+    soup = BeautifulSoup(html, "lxml")
+    title = (soup.title.string if soup.title else "").strip()
+    text_blob = soup.get_text(" ")
+
+    soup = BeautifulSoup(html, "lxml")
+    product_links = []
+    for a in soup.select("a"):
+        href = a.get("href")
+        text = (a.get_text() or "").strip()
+        if href and text:
+            product_links.append((href, text))
+    specs = {}
+    for table in soup.select("table"):
+        header_text = " ".join(h.get_text(" ").lower() for h in table.find_all_previous(["h1","h2","h3"], limit=1))
+        if any(h in header_text for h in SPEC_HEADERS_HINTS):
+            for tr in table.select("tr"):
+                tds = tr.find_all(["td","th"])
+                if len(tds) == 2:
+                    k = tds[0].get_text(" ").strip()
+                    v = tds[1].get_text(" ").strip()
+                    if k and v:
+                        specs[k] = v
+    pdf_links = []
+    for a in soup.select("a[href$='.pdf']"):
+        txt = (a.get_text() or "").strip().lower()
+        if any(w in txt for w in PDF_WORDS):
+            pdf_links.append((a.get("href"), a.get_text(strip=True)))
+
+    selected = [a.get("href") for sel in SELECTORS for a in soup.select(sel) if a.get("href")]
+    return title, text_blob, product_links, specs, pdf_links, selected
+
+
+def _best(fn, html: str, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn(html)
+        times.append(time.perf_counter() - t)
+    return min(times), statistics.median(times)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--products", type=int, default=2000)
+    ap.add_argument("--tables", type=int, default=40)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    for scale in (0.1, 1.0):
+        html = catalog_page(int(args.products * scale), int(args.tables * scale) or 1)
+        before = legacy_parse(html)
+        after = parse_page(html, SELECTORS)
+        assert before[0] == after.title
+        assert before[2] == after.product_links
+        assert before[3] == after.specs
+        assert before[4] == after.pdf_links
+        assert before[5] == after.selected_links
+        assert before[1].split() == after.text.split()
+
+        b_min, b_med = _best(legacy_parse, html, args.repeat)
+        a_min, a_med = _best(lambda h: parse_page(h, SELECTORS), html, args.repeat)
+        print(f"{len(html) / 1024:8.0f} KiB page: before {b_med * 1000:8.1f} ms  after {a_med * 1000:8.1f} ms  "
+              f"speedup x{b_min / a_min:.1f}")
+
+
+if __name__ == "__main__":
+    main()
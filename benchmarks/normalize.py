@@ -0,0 +1,143 @@
+"""Parity and values/s of normalizer.normalize_specs vs. the old pint-per-value path.
+
+    python -m benchmarks.normalize [--products 3000]
+
+The old code built a pint Quantity and called .to() for every numeric value and
+scanned every product type's alias map on a miss. The corpus uses catalog
+aliases, unknown keys and value strings in many units (including ones pint
+can't parse and offset/log units), and every output must be identical.
+"""
+import argparse
+import random
+import time
+
+from src.normalizer import Q_, _num_re, load_catalog, normalize_specs
+
+VALUES = [
+    "20 ton", "20 tons", "70 kW", "240 MBH", "7.5", "460V", "208/230V", "208-230/1/60", "32 A", "32 amps",
+    "45 MOP", "95°F", "35 °C", "78 dB(A)", "78 dB", "78 dBA", "120 in", "120 in.", "3048 mm", "10 ft",
+    "1450 lb", "1450 lbs", "650 kg", "8000 CFM", "8000 cfm", "3.8 m^3/s", "0.75 inH2O", "190 Pa",
+    "1.2 in.wc", "R-410A", "R 32", "r454b", "Yes", "n/a", "", "approx. 12", "12,000 Btu/h", "EER 11.2",
+]
+EXTRA_KEYS = ["Unit Size", "Compressor Type", "Warranty", "Color", "Fan Motor HP", "Sound Power"]
+
+
+_legacy_amap = {}
+
+
+def legacy_normalize_specs(raw, product_type, catalog_path="specs/spec_catalog.json"):
+    cat = load_catalog(catalog_path)
+    amap = _legacy_amap
+    if not amap:
+        # built once per process, as the old module-level cache did
+        for ptype, conf in cat.items():
+            amap[ptype] = {}
+            for canon, meta in conf.get("fields", {}).items():
+                for a in [canon] + list(meta.get("aliases", [])):
+                    amap[ptype][a.strip().lower()] = canon
+
+    def parse(val):
+        s = (val or "").strip()
+        try:
+            s = s.replace("°", " ")
+            s = s.replace("V", " V").replace("v", " V")
+            parts = s.split()
+            if len(parts) >= 2 and _num_re.search(parts[0]):
+                return Q_(float(_num_re.search(parts[0]).group(1)), parts[1])
+        except Exception:
+            pass
+        m = _num_re.search(s)
+        return float(m.group(1)) if m else None
+
+    conf = cat.get(product_type) or {}
+    fields = conf.get("fields", {})
+    out = {k: None for k in fields.keys()}
+    for k_raw, v_raw in (raw or {}).items():
+        k_l = (k_raw or "").strip().lower()
+        canon = amap.get(product_type, {}).get(k_l)
+        if not canon:
+            for p, amapP in amap.items():
+                if k_l in amapP:
+                    canon = amapP[k_l]
+                    break
+        if not canon:
+            continue
+        meta = fields.get(canon, {})
+        v = (v_raw or "").strip()
+        vtype = meta.get("value_type", "string")
+        if vtype == "number":
+            canonical_unit = meta.get("canonical_unit")
+            parsed = parse(v)
+            if parsed is None:
+                continue
+            if canonical_unit and hasattr(parsed, "to"):
+                try:
+                    v_norm = parsed.to(canonical_unit).magnitude
+                except Exception:
+                    v_norm = float(parsed.magnitude if hasattr(parsed, "magnitude") else parsed)
+            else:
+                v_norm = float(parsed.magnitude if hasattr(parsed, "magnitude") else parsed)
+            out[canon] = v_norm
+        elif vtype == "enum":
+            allowed = [str(x).lower() for x in meta.get("allowed", [])]
+            vv = v.lower().replace("r ", "r").replace(" ", "-")
+            if allowed:
+                for a in allowed:
+                    if vv == a.lower() or a.lower() in vv:
+                        out[canon] = a
+                        break
+                if out.get(canon) is None:
+                    out[canon] = vv
+            else:
+                out[canon] = vv
+        elif vtype == "bool":
+            out[canon] = v.lower() in ("yes", "true", "1", "y")
+        else:
+            out[canon] = v
+    return out
+
+
+def corpus(products: int, seed: int = 11):
+    cat = load_catalog()
+    aliases = sorted({a for conf in cat.values() for meta in conf["fields"].values() for a in meta.get("aliases", [])})
+    types = list(cat) + ["unknown", "ahu_doas"]
+    rnd = random.Random(seed)
+    rows = []
+    for _ in range(products):
+        keys = rnd.sample(aliases, 12) + rnd.sample(EXTRA_KEYS, 2)
+        raw = {(k.title() if rnd.random() < 0.5 else f" {k.upper()} "): rnd.choice(VALUES) for k in keys}
+        rows.append((raw, rnd.choice(types)))
+    return rows
+
+
+def _same(a, b) -> bool:
+    if a.keys() != b.keys():
+        return False
+    return all(x == y or (x != x and y != y) for x, y in zip(a.values(), (b[k] for k in a)))
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--products", type=int, default=3000)
+    args = ap.parse_args()
+
+    rows = corpus(args.products)
+    values = sum(len(raw) for raw, _ in rows)
+    normalize_specs({}, "rtu")  # build indexes outside the timed region, as the first crawl page would
+
+    t = time.perf_counter()
+    before = [legacy_normalize_specs(raw, ptype) for raw, ptype in rows]
+    t_before = time.perf_counter() - t
+    t = time.perf_counter()
+    after = [normalize_specs(raw, ptype) for raw, ptype in rows]
+    t_after = time.perf_counter() - t
+
+    mismatches = [(r, a, b) for r, a, b in zip(rows, after, before) if not _same(a, b)]
+    assert not mismatches, mismatches[:3]
+    print(f"parity: {len(rows)} products, {values} raw values")
+    print(f"   before: {values / t_before:10.0f} values/s")
+    print(f"    after: {values / t_after:10.0f} values/s  (x{t_before / t_after:.1f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Rows/s of the offline re-normalization CLI, checked against normalize_specs row by row.
+
+    python -m benchmarks.renormalize [--rows 200000] [--workers N]
+
+Writes a synthetic products.csv (specs drawn from benchmarks.normalize), runs
+src.renormalize.renormalize on it and compares every output cell with what the
+crawl would have written for the same row.
+"""
+import argparse
+import csv
+import json
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.normalize import corpus
+from src.classify import classify_product_type
+from src.normalizer import normalize_specs
+from src.renormalize import renormalize
+from src.save import NORMALIZED_HEADERS, PRODUCT_HEADERS
+
+TITLES = ["RN Series Rooftop Unit", "Air-Cooled Chiller", "LZ Packaged Unit", "Energy Recovery Unit", "Model X"]
+
+
+def write_products(path: str, rows: int, seed: int = 3):
+    rnd = random.Random(seed)
+    specs = corpus(2000, seed)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(PRODUCT_HEADERS)
+        for i in range(rows):
+            raw, _ = specs[i % len(specs)]
+            w.writerow(["EX", f"{rnd.choice(TITLES)} {i}", f"https://example.com/products/{i}/",
+                        rnd.choice(["", f"RN-{i:05d}"]), json.dumps(raw)])
+
+
+def expected_rows(path: str):
+    with open(path, newline="", encoding="utf-8") as f:
+        for r in csv.DictReader(f):
+            ptype = classify_product_type(r["product_title"], r["product_url"], "")
+            n = normalize_specs(json.loads(r["specs_json"]), ptype)
+            row = {h: n.get(h) for h in NORMALIZED_HEADERS}
+            row.update(manufacturer=r["manufacturer"], product_type=ptype, product_title=r["product_title"],
+                       product_url=r["product_url"], model=n.get("model") or r["model_guess"] or "")
+            yield ["" if row[h] is None else str(row[h]) for h in NORMALIZED_HEADERS]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=200000)
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--check", type=int, default=20000, help="Rows compared cell by cell")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src, dst = os.path.join(tmp, "products.csv"), os.path.join(tmp, "normalized.csv")
+        write_products(src, args.rows)
+        t = time.perf_counter()
+        n = renormalize(src, dst, workers=args.workers, reclassify=True)
+        secs = time.perf_counter() - t
+        with open(dst, newline="", encoding="utf-8") as f:
+            got = csv.reader(f)
+            assert next(got) == NORMALIZED_HEADERS
+            for i, (a, b) in enumerate(zip(got, expected_rows(src))):
+                if i >= args.check:
+                    break
+                assert a == b, (i, a, b)
+    print(f"{n} rows in {secs:.1f}s: {n / secs:,.0f} rows/s (first {min(n, args.check)} rows match normalize_specs)")
+
+
+if __name__ == "__main__":
+    main()
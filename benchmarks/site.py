@@ -0,0 +1,200 @@
+"""Synthetic HVAC manufacturer site served from a local HTTP server.
+
+    python -m benchmarks.site [--products 200]   # serve it until Ctrl-C
+
+Home -> category pages (rooftop units, air-cooled chillers) -> product pages.
+Every product page has a "Specifications" table, a submittal PDF with a
+2-column spec table and the line's shared IOM manual; category pages also link
+to support and news pages without specs. Field names are aliases from
+specs/spec_catalog.json, so the whole pipeline (parse, PDF extraction,
+normalization) does real work.
+"""
+import argparse
+import http.server
+import random
+import threading
+from typing import Dict, List, Sequence, Tuple, Union
+
+from src.normalizer import load_catalog
+
+LINES = {
+    "rooftop-units": ("rtu", "Rooftop Unit", "RT"),
+    "air-cooled-chillers": ("chiller_air_cooled", "Air-Cooled Chiller", "AC"),
+}
+# Values per canonical unit, in the units manufacturers print
+VALUES = {
+    "ton": lambda r: r.choice([f"{r.randint(3, 150)} ton", f"{r.randint(10, 500)} kW", f"{r.randint(36, 900)} MBH"]),
+    "A": lambda r: f"{r.randint(10, 400)} A",
+    "in": lambda r: r.choice([f"{r.randint(30, 400)} in", f"{r.randint(800, 9000)} mm"]),
+    "lb": lambda r: r.choice([f"{r.randint(300, 12000)} lb", f"{r.randint(150, 5000)} kg"]),
+    "CFM": lambda r: f"{r.randint(800, 40000)} CFM",
+    "inH2O": lambda r: f"{r.uniform(0.2, 2.5):.2f} in. w.c.",
+    "dB(A)": lambda r: f"{r.randint(60, 95)} dB(A)",
+}
+
+
+def make_pdf(pages: Sequence[Sequence[Tuple[str, str]]]) -> bytes:
+    """A PDF with one ruled 2-column table per page, which pdfplumber's extract_tables reads back."""
+    objects = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    contents = []
+    for rows in pages:
+        x0, x1, x2, top, h = 50, 250, 450, 750, 20
+        ops = ["0.5 w"]
+        for i, (k, v) in enumerate(rows):
+            y = top - i * h - 14
+            for x, text in ((x0, k), (x1, v)):
+                text = text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+                ops.append(f"BT /F1 10 Tf {x + 4} {y} Td ({text}) Tj ET")
+        for i in range(len(rows) + 1):
+            ops.append(f"{x0} {top - i * h} m {x2} {top - i * h} l S")
+        for x in (x0, x1, x2):
+            ops.append(f"{x} {top} m {x} {top - len(rows) * h} l S")
+        stream = "\n".join(ops).encode("latin-1")
+        contents.append(add(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream)))
+    pages_id = len(objects) + len(contents) + 1
+    kids = [add(b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 792] /Contents %d 0 R "
+                b"/Resources << /Font << /F1 %d 0 R >> >> >>" % (pages_id, c, font)) for c in contents]
+    add(b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(b"%d 0 R" % k for k in kids), len(kids)))
+    root = add(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (i, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % o for o in offsets)
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, root, xref)
+    return bytes(out)
+
+
+def _spec_rows(rnd: random.Random, ptype: str, model: str) -> List[Tuple[str, str]]:
+    rows = []
+    for canon, meta in load_catalog()[ptype]["fields"].items():
+        alias = rnd.choice(meta["aliases"]).title()
+        if canon == "model":
+            value = model
+        elif meta.get("allowed"):
+            value = rnd.choice(meta["allowed"])
+        elif meta["value_type"] == "number":
+            unit = meta.get("canonical_unit")
+            value = VALUES[unit](rnd) if unit in VALUES else f"{rnd.uniform(8, 25):.1f}"
+        elif canon == "power_supply":
+            value = rnd.choice(["208-230/3/60", "460/3/60", "575/3/60"])
+        else:
+            value = f"{rnd.randint(1000000, 9999999)}"
+        rows.append((alias, value))
+    return rows
+
+
+def _html(title: str, body: str) -> str:
+    nav = '<nav><a href="/">Home</a> <a href="/about/privacy">Privacy</a> <a href="/careers">Careers</a></nav>'
+    return f"<!doctype html><html><head><title>{title}</title></head><body>{nav}<h1>{title}</h1>{body}</body></html>"
+
+
+def _links(links) -> str:
+    return "<ul>" + "".join(f'<li><a href="{href}">{text}</a></li>' for href, text in links) + "</ul>"
+
+
+def build_site(products: int = 200, noise: int = 40, pdf_pages: int = 2, seed: int = 5) -> Dict[str, Union[str, bytes]]:
+    """Path -> HTML string or PDF bytes."""
+    rnd = random.Random(seed)
+    site = {"/robots.txt": "User-agent: *\nAllow: /\n"}
+    noise_links = [(f"/{rnd.choice(['product-support', 'products/news'])}/item-{i}", f"Read more {i}")
+                   for i in range(noise)]
+    for href, text in noise_links:
+        site[href] = _html(text, "<p>" + "Lorem ipsum dolor sit amet. " * 40 + "</p>")
+
+    details = {line: [] for line in LINES}
+    for i in range(products):
+        line = list(LINES)[i % len(LINES)]
+        ptype, name, prefix = LINES[line]
+        model = f"{prefix}-{100 + i}"
+        href = f"/products/{line}/{model.lower()}"
+        details[line].append((href, model))
+        rows = _spec_rows(rnd, ptype, model)
+        html_rows, pdf_rows = rows[:4], rows[4:]
+        per_page = -(-len(pdf_rows) // pdf_pages)
+        site[f"/docs/{model}-submittal.pdf"] = make_pdf(
+            [pdf_rows[p:p + per_page] for p in range(0, len(pdf_rows), per_page)])
+        table = "".join(f"<tr><td>{k}</td><td>{v}</td></tr>" for k, v in html_rows)
+        site[href] = _html(f"{name} {model}", (
+            f"<p>Model: {model}. The {name.lower()} for commercial buildings. "
+            + "High efficiency, quiet operation and easy service access. " * 20 + "</p>"
+            f"<h2>Specifications</h2><table>{table}</table>"
+            f'<a href="/docs/{model}-submittal.pdf">Submittal</a> <a href="/docs/{line}-iom.pdf">IOM manual</a>'
+        ))
+    for line, (ptype, name, _) in LINES.items():
+        site[f"/docs/{line}-iom.pdf"] = make_pdf([[("Refrigerant", "R-410A"), ("Voltage", "460/3/60")]] * 3)
+        site[f"/products/{line}/"] = _html(f"{name}s", _links(details[line] + rnd.sample(noise_links, min(10, noise))))
+    site["/"] = _html("Example HVAC", _links([(f"/products/{line}/", f"{name}s") for line, (_, name, _)
+                                              in LINES.items()] + rnd.sample(noise_links, min(10, noise))))
+    # detail pages link back to their siblings, as real catalogs do
+    for line in LINES:
+        for href, model in details[line]:
+            related = rnd.sample(details[line], min(3, len(details[line])))
+            site[href] = site[href].replace("</body>", _links(related) + "</body>")
+    return site
+
+
+def serve(site: Dict[str, Union[str, bytes]]) -> Tuple[str, http.server.ThreadingHTTPServer]:
+    """Serve `site` on a free local port; returns (base URL, server). Call server.shutdown() when done."""
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _send(self, head: bool):
+            body = site.get(self.path)
+            if body is None:
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            if isinstance(body, bytes):
+                ctype, data = "application/pdf", body
+            else:
+                ctype = "text/plain" if self.path.endswith(".txt") else "text/html; charset=utf-8"
+                data = body.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            if not head:
+                self.wfile.write(data)
+
+        def do_GET(self):
+            self._send(False)
+
+        def do_HEAD(self):
+            self._send(True)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}", server
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--products", type=int, default=200)
+    args = ap.parse_args()
+    base, server = serve(build_site(args.products))
+    print(f"Serving a synthetic site with {args.products} products at {base}/ (Ctrl-C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Time to first page: a cold `python -m src.crawl` per job vs. a job posted to the warm worker.
+
+    python -m benchmarks.startup [--runs 5] [--fetch http]
+
+Both paths crawl the same product page of the local synthetic site
+(benchmarks.site) with --progress-json; the clock stops at the first progress
+line, i.e. once that page is fetched, parsed, its PDFs extracted and its row
+written. The cold path also pays interpreter start, imports and (with
+--fetch auto/browser) the Chromium launch; the warm worker paid those once.
+Also reports how long `import src.crawl` takes.
+"""
+import argparse
+import json
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+from benchmarks.site import build_site, serve
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _first_line(stream) -> float:
+    for line in stream:
+        if line.lstrip().startswith(b"{"):
+            return time.perf_counter()
+    raise RuntimeError("no progress line")
+
+
+def import_seconds(runs: int) -> float:
+    times = []
+    for _ in range(runs):
+        t = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "import src.crawl"], check=True)
+        times.append(time.perf_counter() - t)
+    return min(times)
+
+
+def cold(seed_path: str, fetch: str, work_dir: str, runs: int, env: dict):
+    firsts, totals = [], []
+    for i in range(runs):
+        cmd = [sys.executable, "-m", "src.crawl", "--seed", seed_path, "--limit", "1", "--progress-json",
+               "--fetch", fetch, "--output-dir", os.path.join(work_dir, f"cold{i}")]
+        t = time.perf_counter()
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, env=env)
+        firsts.append(_first_line(proc.stdout) - t)
+        proc.stdout.read()
+        proc.wait()
+        totals.append(time.perf_counter() - t)
+    return firsts, totals
+
+
+def warm(seed: dict, fetch: str, work_dir: str, runs: int, env: dict):
+    port = _free_port()
+    t = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "-m", "src.worker", "--port", str(port)],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=env)
+    try:
+        while True:
+            try:
+                urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1).read()
+                break
+            except OSError:
+                if proc.poll() is not None:
+                    raise RuntimeError("worker exited")
+                time.sleep(0.05)
+        ready = time.perf_counter() - t
+        firsts, totals = [], []
+        for i in range(runs):
+            job = {"seed": seed, "limit": 1, "fetch": fetch, "output_dir": os.path.join(work_dir, f"warm{i}")}
+            req = urllib.request.Request(f"http://127.0.0.1:{port}/jobs", json.dumps(job).encode(), method="POST")
+            t = time.perf_counter()
+            with urllib.request.urlopen(req) as resp:
+                firsts.append(_first_line(resp) - t)
+                resp.read()
+            totals.append(time.perf_counter() - t)
+    finally:
+        proc.send_signal(signal.SIGINT)
+        proc.wait()
+    return ready, firsts, totals
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--fetch", choices=["http", "auto", "browser"], default="http",
+                    help="auto/browser also time the Chromium launch (needs `playwright install chromium`)")
+    ap.add_argument("--out", help="Also save the results as JSON")
+    args = ap.parse_args()
+
+    base, server = serve(build_site(20))
+    seed = {"manufacturer": "BENCH", "base_url": base, "start_urls": [f"{base}/products/rooftop-units/rt-100"],
+            "product_link_selectors": ["a[href*='/products/']"], "max_depth": 0}
+    with tempfile.TemporaryDirectory() as work_dir:
+        env = dict(os.environ, CRAWL_DELAY="0", CRAWL_MIN_DELAY="0", PDF_STORE_DIR=os.path.join(work_dir, "store"),
+                   FETCH_MODE=args.fetch)
+        env.pop("CRAWL_STATE_PATH", None)
+        seed_path = os.path.join(work_dir, "seed.json")
+        with open(seed_path, "w", encoding="utf-8") as f:
+            json.dump(seed, f)
+        imports = import_seconds(3)
+        cold_first, cold_total = cold(seed_path, args.fetch, work_dir, args.runs, env)
+        ready, warm_first, warm_total = warm(seed, args.fetch, work_dir, args.runs, env)
+    server.shutdown()
+
+    med = statistics.median
+    result = {
+        "fetch": args.fetch,
+        "import_src_crawl_s": round(imports, 3),
+        "cold_first_page_s": round(med(cold_first), 3),
+        "cold_job_s": round(med(cold_total), 3),
+        "worker_ready_s": round(ready, 3),
+        "warm_first_page_s": round(med(warm_first), 3),
+        "warm_job_s": round(med(warm_total), 3),
+    }
+    print(f"import src.crawl:              {result['import_src_crawl_s']:.2f}s")
+    print(f"cold CLI, first page:          {result['cold_first_page_s']:.2f}s  (whole job {result['cold_job_s']:.2f}s)")
+    print(f"warm worker, first page:       {result['warm_first_page_s']:.2f}s  (whole job {result['warm_job_s']:.2f}s; "
+          f"worker ready after {result['worker_ready_s']:.2f}s, once)")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""End-to-end crawl of a local synthetic site plus stage microbenchmarks, saved as JSON.
+
+    python -m benchmarks.suite [--products 200] [--concurrency 4] [--out bench.json] [--compare old.json]
+
+Serves benchmarks.site on 127.0.0.1, runs `crawl.run` over plain HTTP with no
+politeness delay and a fresh PDF store, and records pages/s, PDFs/s, peak RSS
+and the per-stage times from src.metrics. Then times extract_links_and_specs,
+extract_kv_from_pdf, normalize_specs and classify_product_type on the same
+pages and PDFs. Save one JSON per commit and compare them with --compare.
+"""
+import argparse
+import csv
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+
+from benchmarks.site import LINES, build_site, serve
+
+# (section, key, label) of the figures --compare prints; higher is better except where noted
+HEADLINE = [
+    ("crawl", "pages_per_s", "crawl pages/s"),
+    ("crawl", "pdfs_per_s", "crawl PDFs/s"),
+    ("crawl", "peak_rss_mb", "peak RSS MB (lower is better)"),
+    ("micro", "extract_links_and_specs", "extract_links_and_specs pages/s"),
+    ("micro", "extract_kv_from_pdf", "extract_kv_from_pdf PDFs/s"),
+    ("micro", "normalize_specs", "normalize_specs products/s"),
+    ("micro", "classify_product_type", "classify_product_type pages/s"),
+]
+
+
+def _commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def _best_rate(fn, items, repeat: int) -> float:
+    """Items per second of the fastest of `repeat` passes of `fn` over `items`."""
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        for item in items:
+            fn(item)
+        best = min(best, time.perf_counter() - t)
+    return len(items) / best
+
+
+def run_crawl(site, products: int, concurrency: int, work_dir: str) -> dict:
+    # the crawler reads its settings from the environment at import time
+    os.environ.update({
+        "OUTPUT_DIR": os.path.join(work_dir, "output"),
+        "PDF_STORE_DIR": os.path.join(work_dir, "pdf_store"),
+        "CRAWL_DELAY": "0",
+        "CRAWL_MIN_DELAY": "0",
+    })
+    os.environ.pop("CRAWL_STATE_PATH", None)
+    os.environ.pop("METRICS_TEXTFILE", None)
+    from src import crawl
+    from src.memory import MB, python_peak_rss
+    from src.metrics import METRICS
+
+    base, server = serve(site)
+    try:
+        cfg = crawl.site_from_url(base + "/", "BENCH")
+        cfg.base_url = base
+        t = time.perf_counter()
+        crawl.run(cfg, products, output_dir=os.environ["OUTPUT_DIR"], concurrency=concurrency, fetch_mode="http")
+        seconds = time.perf_counter() - t
+    finally:
+        server.shutdown()
+
+    with open(os.path.join(os.environ["OUTPUT_DIR"], "products.csv"), newline="", encoding="utf-8") as f:
+        saved = sum(1 for _ in csv.DictReader(f))
+    snap = METRICS.snapshot()
+    pages = snap["stages"].get("http_fetch", {}).get("n", 0)
+    pdfs = METRICS.value("pdf_store", event="fetch_misses")
+    return {
+        "seconds": round(seconds, 3),
+        "pages": pages,
+        "products": saved,
+        "pdfs": pdfs,
+        "pages_per_s": round(pages / seconds, 2),
+        "pdfs_per_s": round(pdfs / seconds, 2),
+        "peak_rss_mb": round(python_peak_rss() / MB, 1) if python_peak_rss() else None,
+        "stages": snap["stages"],
+        "bytes_fetched": snap["bytesFetched"],
+        "errors": snap["errors"],
+        "settings": {k: getattr(crawl, k) for k in ("PDF_WORKERS", "PDF_SCAN_MODE", "FRONTIER", "OUTPUT_FORMATS")},
+    }
+
+
+def run_micro(site, repeat: int) -> dict:
+    from src.classify import classify_product_type
+    from src.html_parser import extract_links_and_specs, parse_page
+    from src.normalizer import normalize_specs
+    from src.pdf_parser import extract_kv_from_pdf
+
+    details = tuple(f"/products/{line}/" for line in LINES)
+    pages = [(path, html) for path, html in site.items() if path.startswith(details) and not path.endswith("/")]
+    parsed = [(path, parse_page(html)) for path, html in pages]
+    labelled = [(p.title, "https://example.com" + path, p.text) for path, p in parsed]
+    submittals = [site[f"/docs/{path.rsplit('/', 1)[1].upper()}-submittal.pdf"] for path, _ in pages]
+    pdfs = submittals[:50]
+    # what finalize normalizes: HTML specs plus the submittal's table, under the page's product type
+    raw = [dict(p.specs, **extract_kv_from_pdf(pdf)) for (_, p), pdf in zip(parsed, pdfs)]
+    types = [classify_product_type(*row) for row in labelled[:len(raw)]]
+    normalize_specs({}, "rtu")  # build the catalog indexes outside the timed region, as the first page would
+
+    rates = {
+        "extract_links_and_specs": _best_rate(lambda item: extract_links_and_specs(item[1], "https://example.com"),
+                                              pages, repeat),
+        "extract_kv_from_pdf": _best_rate(extract_kv_from_pdf, pdfs, repeat),
+        "normalize_specs": _best_rate(lambda item: normalize_specs(*item), list(zip(raw, types)), repeat),
+        "classify_product_type": _best_rate(lambda row: classify_product_type(*row), labelled, repeat),
+    }
+    return {name: round(rate, 1) for name, rate in rates.items()}
+
+
+def compare(old: dict, new: dict) -> str:
+    lines = [f"{'':34}{old.get('commit') or 'old':>12}{new.get('commit') or 'new':>12}   change"]
+    for section, key, label in HEADLINE:
+        a, b = old.get(section, {}).get(key), new.get(section, {}).get(key)
+        change = f"{(b / a - 1) * 100:+.1f}%" if a and b is not None else ""
+        lines.append(f"{label:34}{a if a is not None else '-':>12}{b if b is not None else '-':>12}   {change}")
+    return "\n".join(lines)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--products", type=int, default=200, help="Products on the synthetic site (all are crawled)")
+    ap.add_argument("--concurrency", type=int, default=4)
+    ap.add_argument("--repeat", type=int, default=3, help="Microbenchmark passes (the fastest counts)")
+    ap.add_argument("--out", default="bench.json")
+    ap.add_argument("--compare", metavar="JSON", help="Earlier result to compare against")
+    args = ap.parse_args()
+
+    site = build_site(args.products)
+    with tempfile.TemporaryDirectory() as work_dir:
+        crawl_result = run_crawl(site, args.products, args.concurrency, work_dir)
+    result = {
+        "commit": _commit(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "products": args.products,
+        "concurrency": args.concurrency,
+        "crawl": crawl_result,
+        "micro": run_micro(site, args.repeat),
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    print(f"\nSaved {args.out}")
+    print(json.dumps({"crawl": {k: v for k, v in crawl_result.items() if not isinstance(v, dict)},
+                      "micro": result["micro"]}, indent=2))
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            print(compare(json.load(f), result))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,116 @@
+import itertools
 import re
+from typing import Iterable, List, Tuple
 
-def classify_product_type(title: str, url: str, page_text: str) -> str:
-    t = f"{title} {url} {page_text}".lower()
-    rules = [
-        (r"rtu|rooftop", "rtu"),
-        (r"chiller|air[- ]cooled chiller", "chiller_air_cooled"),
-        (r"doas|dedicated outdoor air|energy recovery|erv|hrv|ahu", "ahu_doas"),
-        (r"vrf|vrv|mini[- ]split", "vrf_od"),
-        (r"boiler|water heater", "boiler"),
-        (r"pump|circulator", "pump"),
-        (r"cooling tower|evapco|closed[- ]circuit", "cooling_tower"),
-        (r"fan coil|fcu", "fcu"),
-        (r"ptac|vtac", "ptac"),
-        (r"heat exchanger|plate|sondex", "hx"),
-        (r"vfd|drive|eaton", "vfd"),
-        (r"filter|iaq|ion", "filter_iaq"),
-    ]
-    for pat, label in rules:
+# Checked in order: the first rule matching anywhere in the text wins
+RULES = [
+    (r"rtu|rooftop", "rtu"),
+    (r"chiller|air[- ]cooled chiller", "chiller_air_cooled"),
+    (r"doas|dedicated outdoor air|energy recovery|erv|hrv|ahu", "ahu_doas"),
+    (r"vrf|vrv|mini[- ]split", "vrf_od"),
+    (r"boiler|water heater", "boiler"),
+    (r"pump|circulator", "pump"),
+    (r"cooling tower|evapco|closed[- ]circuit", "cooling_tower"),
+    (r"fan coil|fcu", "fcu"),
+    (r"ptac|vtac", "ptac"),
+    (r"heat exchanger|plate|sondex", "hx"),
+    (r"vfd|drive|eaton", "vfd"),
+    (r"filter|iaq|ion", "filter_iaq"),
+]
+
+_META = set(".^$*+?{}()\\")
+
+# Written out by hand rather than derived from RULES, so a keyword the expansion drops is still checked
+PARITY_KEYWORDS = [
+    "rtu", "rooftop", "chiller", "air-cooled chiller", "air cooled chiller", "doas", "dedicated outdoor air",
+    "energy recovery", "erv", "hrv", "ahu", "vrf", "vrv", "mini-split", "mini split", "boiler", "water heater",
+    "pump", "circulator", "cooling tower", "evapco", "closed-circuit", "closed circuit", "fan coil", "fcu",
+    "ptac", "vtac", "heat exchanger", "plate", "sondex", "vfd", "drive", "eaton", "filter", "iaq", "ion",
+]
+
+
+def _compile_rule(pat: str):
+    """Expand a rule into the literal keywords it matches, e.g. "mini[- ]split" ->
+    ("mini-split", "mini split"). Substring checks on literals run in C without
+    regex overhead; a rule that isn't a plain alternation of literals and simple
+    character classes stays a compiled regex."""
+    literals = []
+    for alt in pat.split("|"):
+        # even items are literal text, odd items the characters of a [...] class
+        parts = re.split(r"\[([^\]]+)\]", alt)
+        for i, part in enumerate(parts):
+            if i % 2 == 0 and _META & set(part):
+                return re.compile(pat)
+            if i % 2 == 1 and (part.startswith("^") or "-" in part[1:-1] or "\\" in part):
+                return re.compile(pat)
+        options = [[p] if i % 2 == 0 else list(p) for i, p in enumerate(parts)]
+        literals.extend("".join(combo) for combo in itertools.product(*options))
+    return tuple(literals)
+
+
+_COMPILED = [(_compile_rule(pat), label) for pat, label in RULES]
+
+
+def _match(t: str) -> str:
+    for rule, label in _COMPILED:
+        if isinstance(rule, tuple):
+            if any(k in t for k in rule):
+                return label
+        elif rule.search(t):
+            return label
+    return "unknown"
+
+
+def _regex_match(t: str) -> str:
+    """The original classifier: one re.search per rule, in rule order."""
+    for pat, label in RULES:
         if re.search(pat, t):
             return label
     return "unknown"
 
+
+def _parity_samples() -> List[str]:
+    """Texts probing the literal expansion: every keyword alone, inside words, in mixed
+    case and spelled with near-miss separators, and keywords of two rules together
+    in both orders (the earlier rule must win)."""
+    expanded = [k for rule, _ in _COMPILED if isinstance(rule, tuple) for k in rule]
+    keywords = list(dict.fromkeys(PARITY_KEYWORDS + expanded))
+    firsts = [rule[0] for rule, _ in _COMPILED if isinstance(rule, tuple)]
+    samples = ["", "unit cabinet series", "specification", "version", "overdrive", "templates",
+               "air-cooled chiller", "plate chiller", "minisplit", "mini_split", "closed  circuit"]
+    for k in keywords:
+        samples += [k, k.upper(), k.title(), f"x{k}y", k.replace(" ", "-"), k.replace("-", " "), k.replace(" ", "")]
+    samples += [f"{a} {b}" for a in firsts for b in firsts if a != b]
+    return samples
+
+
+def check_parity(samples: Iterable[str] = None):
+    """Raise ValueError where the literal keywords label a text differently from the rule regexes."""
+    for text in _parity_samples() if samples is None else samples:
+        t = text.lower()
+        got, expected = _match(t), _regex_match(t)
+        if got != expected:
+            raise ValueError(f"classify: {text!r} matched {got!r}, the rule regexes say {expected!r}")
+
+
+# a few hundred substring checks: an edit to RULES that the literal expansion gets wrong fails on import
+check_parity()
+
+
+def classify_product_type(title: str, url: str, page_text: str, tiered: bool = False) -> str:
+    """Classify a product page into a spec_catalog product type.
+
+    With `tiered=True` the title and URL are scored first and the page text is
+    only searched when they match no rule; this is much faster on long pages but
+    can differ from the default when the body mentions a higher-priority keyword.
+    """
+    if tiered:
+        label = _match(f"{title} {url}".lower())
+        if label != "unknown":
+            return label
+    return _match(f"{title} {url} {page_text}".lower())
+
+
+def classify_many(rows: Iterable[Tuple[str, str, str]], tiered: bool = False) -> List[str]:
+    """Classify (title, url, page_text) tuples, e.g. rows re-read from products.csv."""
+    return [classify_product_type(title, url, text, tiered) for title, url, text in rows]
@@ -1,24 +1,33 @@
 import argparse
+import asyncio
+import functools
+import glob
 import os
+import threading
 import time
 import json
 import requests
+from concurrent.futures import Future, ThreadPoolExecutor
 from urllib.parse import urlparse
-from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 from tenacity import retry, stop_after_attempt, wait_exponential
 from tqdm import tqdm
-from playwright.sync_api import sync_playwright
-
-from .site_config import SiteConfig
-from .robots import allowed
-from .html_parser import extract_links_and_specs, guess_model
-from .pdf_parser import extract_kv_from_pdf
-from .utils import sha256_bytes, safe_filename, ensure_dir, join_url
-from .save import (
-    init_outputs, append_row, PRODUCTS_CSV, DOCS_CSV, PRODUCT_HEADERS, DOC_HEADERS,
-    append_normalized
-)
+
+from .site_config import RENDER_PROFILES, SiteConfig
+from .robots import RobotsCache
+from .ratelimit import AdaptiveRateLimiter
+from .fetcher import FetchStrategy, get_session
+from .crawl_state import CrawlState
+from .dedupe import DuplicateIndex, Fingerprint, fingerprint
+from .frontier import Frontier, LinkScorer, PriorityFrontier
+from .html_parser import PDF_WORDS, ParsedPage, parse_page, guess_model
+from .pdf_download import PdfDownloader
+from .pdf_pipeline import PdfExtractionStage
+from .pdf_store import PdfStore
+from .memory import MB, browser_rss, python_peak_rss
+from .metrics import METRICS
+from .utils import safe_filename, join_url, sha256_bytes
+from .save import OutputWriter, PRODUCT_HEADERS, DOC_HEADERS, ALIAS_HEADERS
 from .classify import classify_product_type
 from .normalizer import normalize_specs
 
@@ -26,16 +35,80 @@ load_dotenv()
 USER_AGENT = os.getenv("USER_AGENT", "Load55Scraper/0.2")
 OUTPUT_DIR = os.getenv("OUTPUT_DIR", "output")
 CRAWL_DELAY = float(os.getenv("CRAWL_DELAY", "2"))
+# Healthy hosts speed up to one request per CRAWL_MIN_DELAY (robots.txt may ask for slower);
+# 429/503 responses back off up to CRAWL_MAX_DELAY
+CRAWL_MIN_DELAY = float(os.getenv("CRAWL_MIN_DELAY", "0.5"))
+CRAWL_MAX_DELAY = float(os.getenv("CRAWL_MAX_DELAY", "60"))
+CRAWL_BURST = int(os.getenv("CRAWL_BURST", "1"))
+# Extra attempts for a page answered with 429/503
+THROTTLE_RETRIES = 2
+# Number of Playwright pages crawling the shared frontier at once
+CONCURRENCY = int(os.getenv("CONCURRENCY", "1"))
+# "auto" tries plain HTTP first and escalates to Playwright; "browser" or "http" force one path
+FETCH_MODE = os.getenv("FETCH_MODE", "auto")
+# robots.txt files are cached on disk for ROBOTS_TTL_HOURS (or a shorter Cache-Control max-age) and fetched
+# with a ROBOTS_TIMEOUT (seconds), so a hanging robots.txt cannot stall the crawl
+ROBOTS_CACHE_DIR = os.getenv("ROBOTS_CACHE_DIR", os.path.join(OUTPUT_DIR, "robots_cache"))
+ROBOTS_TTL_HOURS = float(os.getenv("ROBOTS_TTL_HOURS", "24"))
+ROBOTS_TIMEOUT = float(os.getenv("ROBOTS_TIMEOUT", "10"))
+# Content-addressed PDF store shared by all jobs (downloads + cached extraction results)
+PDF_STORE_DIR = os.getenv("PDF_STORE_DIR", os.path.join(OUTPUT_DIR, "pdf_store"))
+PDF_STORE_MAX_MB = int(os.getenv("PDF_STORE_MAX_MB", "2048"))
+PDF_STORE_TTL_DAYS = float(os.getenv("PDF_STORE_TTL_DAYS", "7"))
+# Threads downloading PDFs (a page's documents are fetched at once, still paced per host), and the largest
+# PDF downloaded in MB (0 = no limit); responses that are not PDFs are dropped before their body is stored
+PDF_DOWNLOAD_WORKERS = int(os.getenv("PDF_DOWNLOAD_WORKERS", "8"))
+PDF_MAX_MB = float(os.getenv("PDF_MAX_MB", "50"))
+# Worker processes parsing PDFs, and how many documents may wait for them
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", str(os.cpu_count() or 2)))
+PDF_QUEUE_SIZE = int(os.getenv("PDF_QUEUE_SIZE", str(PDF_WORKERS * 2)))
+# "lazy" extracts tables only from pages whose text mentions catalog aliases; "full" scans every page
+PDF_SCAN_MODE = os.getenv("PDF_SCAN_MODE", "full")
+# Per-document budgets for lazy scans (0 = unlimited)
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "0"))
+PDF_TIME_BUDGET = float(os.getenv("PDF_TIME_BUDGET", "0"))
+# Expected URLs per site above which the frontier's seen-set becomes a Bloom filter (0 = exact set)
+FRONTIER_BLOOM_CAPACITY = int(os.getenv("FRONTIER_BLOOM_CAPACITY", "0"))
+# "best" visits the links most likely to be product pages first; "bfs" crawls level by level
+FRONTIER = os.getenv("FRONTIER", "best")
+# Checkpointed frontier + per-page validators (default: crawl_state.sqlite in the output directory);
+# ignored when --output-dir is given
+CRAWL_STATE_PATH = os.getenv("CRAWL_STATE_PATH")
+# Browser navigations: "light" blocks images/media/fonts/trackers and stops at DOMContentLoaded plus the
+# site's wait selector (at most RENDER_WAIT_MS); "full" waits for the load event. Seeds may override it.
+RENDER_PROFILE = os.getenv("RENDER_PROFILE", "light")
+if RENDER_PROFILE not in RENDER_PROFILES:
+    raise ValueError(f"RENDER_PROFILE must be one of {', '.join(RENDER_PROFILES)}, not {RENDER_PROFILE!r}")
+RENDER_WAIT_MS = int(os.getenv("RENDER_WAIT_MS", "5000"))
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
+TRACKER_HOSTS = (
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net", "googleadservices.com",
+    "facebook.net", "facebook.com", "hotjar.com", "hs-analytics.net", "hs-scripts.com", "hubspot.com",
+    "segment.io", "segment.com", "clarity.ms", "bat.bing.com", "ads.linkedin.com", "nr-data.net",
+    "newrelic.com", "optimizely.com", "quantserve.com", "adroll.com", "crazyegg.com",
+)
+# Batch mode: pages (with their PDF downloads) in flight across all sites at once
+BATCH_MAX_IN_FLIGHT = int(os.getenv("BATCH_MAX_IN_FLIGHT", "8"))
+# Long crawls: each tab gets a fresh browser context after BROWSER_RECYCLE_PAGES navigations, and all tabs do
+# once the browser processes exceed BROWSER_MAX_RSS_MB (0 = no limit; sampled every BROWSER_RSS_CHECK_PAGES)
+BROWSER_RECYCLE_PAGES = int(os.getenv("BROWSER_RECYCLE_PAGES", "200"))
+BROWSER_MAX_RSS_MB = int(os.getenv("BROWSER_MAX_RSS_MB", "0"))
+BROWSER_RSS_CHECK_PAGES = int(os.getenv("BROWSER_RSS_CHECK_PAGES", "25"))
+# Characters of page text kept for product type classification and the model guess
+PAGE_TEXT_LIMIT = int(os.getenv("PAGE_TEXT_LIMIT", "200000"))
+# Product pages whose spec table, model and PDF names match a page already crawled and whose text simhash is at most
+# DEDUPE_DISTANCE bits away are recorded as aliases, without PDF downloads or a product row (-1 = off)
+DEDUPE_DISTANCE = int(os.getenv("DEDUPE_DISTANCE", "3"))
+# Stage timers and counters are always collected; set a path to also export them as a Prometheus textfile
+METRICS_TEXTFILE = os.getenv("METRICS_TEXTFILE")
+METRICS_INTERVAL = float(os.getenv("METRICS_INTERVAL", "15"))
+# Output files: comma-separated formats (csv, jsonl, parquet) and how often buffered rows are flushed
+OUTPUT_FORMATS = os.getenv("OUTPUT_FORMATS", "csv")
+OUTPUT_BATCH_SIZE = int(os.getenv("OUTPUT_BATCH_SIZE", "50"))
+OUTPUT_FLUSH_SECONDS = float(os.getenv("OUTPUT_FLUSH_SECONDS", "5"))
 
 DENY_DEFAULT = ["/privacy", "/terms", "/careers", "/contact", "/news"]
 
-@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=8))
-def http_get(url: str) -> requests.Response:
-    r = requests.get(url, headers={"User-Agent": USER_AGENT}, timeout=30)
-    r.raise_for_status()
-    return r
-
-
 def is_denied(url: str, deny_patterns):
     path = urlparse(url).path.lower()
     for pat in deny_patterns:
@@ -44,32 +117,6 @@ def is_denied(url: str, deny_patterns):
     return False
 
 
-def collect_product_links(page, selectors, base_url, deny_patterns, max_links=500):
-    found = set()
-    for sel in selectors:
-        anchors = page.query_selector_all(sel)
-        for a in anchors:
-            href = a.get_attribute("href")
-            if not href:
-                continue
-            full = join_url(base_url, href)
-            if full in found:
-                continue
-            if is_denied(full, deny_patterns):
-                continue
-            if urlparse(full).netloc != urlparse(base_url).netloc:
-                continue
-            found.add(full)
-            if len(found) >= max_links:
-                return list(found)
-    return list(found)
-
-
-def download_pdf(url: str) -> bytes:
-    resp = http_get(url)
-    return resp.content
-
-
 def site_from_url(url: str, manufacturer: str = None):
     netloc = urlparse(url).netloc
     base_url = f"https://{netloc}"
@@ -85,171 +132,901 @@ def site_from_url(url: str, manufacturer: str = None):
     )
 
 
-def run(cfg: SiteConfig, limit: int, default_product_type: str = None, output_dir: str = None, progress_json: bool = False):
-    if output_dir:
-        # Use custom output directory for job-specific results
-        import os
-        os.makedirs(output_dir, exist_ok=True)
-        os.makedirs(os.path.join(output_dir, "files"), exist_ok=True)
-        # Update save module paths
-        import sys
-        sys.modules['src.save'].PRODUCTS_CSV = os.path.join(output_dir, "products.csv")
-        sys.modules['src.save'].DOCS_CSV = os.path.join(output_dir, "documents.csv")
-        sys.modules['src.save'].NORMALIZED_CSV = os.path.join(output_dir, "normalized_products.csv")
-        sys.modules['src.save'].init_outputs()
-    else:
-        init_outputs()
-    
-    deny_patterns = (cfg.deny_patterns or []) + DENY_DEFAULT
-
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        context = browser.new_context(user_agent=USER_AGENT)
-        page = context.new_page()
-
-        visited = set()
-        queue = [(u, 0) for u in cfg.start_urls]
-        pbar = tqdm(total=limit, desc=f"Crawling {cfg.manufacturer}")
-
-        while queue and pbar.n < limit:
-            url, depth = queue.pop(0)
-            if url in visited:
-                continue
-            visited.add(url)
+class _Shared:
+    """What all crawls in one process share: robots.txt, the per-host limiter, the PDF store and PDF pool."""
 
-            if not allowed(USER_AGENT, cfg.base_url, url):
-                continue
-            if is_denied(url, deny_patterns):
-                continue
+    def __init__(self):
+        self.robots = RobotsCache(ROBOTS_CACHE_DIR, USER_AGENT, ROBOTS_TTL_HOURS * 3600, ROBOTS_TIMEOUT)
+        # one budget per host for page fetches, navigations and PDF downloads
+        self.limiter = AdaptiveRateLimiter(CRAWL_DELAY, CRAWL_MIN_DELAY, CRAWL_MAX_DELAY, CRAWL_BURST,
+                                           self.robots.crawl_delay)
+        self.pdf_store = PdfStore(PDF_STORE_DIR, PDF_STORE_MAX_MB * 1024 * 1024, PDF_STORE_TTL_DAYS * 86400)
+        self.download_pool = ThreadPoolExecutor(max_workers=max(1, PDF_DOWNLOAD_WORKERS),
+                                                thread_name_prefix="pdf-download")
+        self.pdf_stage = PdfExtractionStage(PDF_WORKERS, PDF_QUEUE_SIZE, PDF_SCAN_MODE, PDF_MAX_PAGES,
+                                            PDF_TIME_BUDGET)
+        # highest browser RSS sampled by `_Browser.check_memory`
+        self.browser_peak_rss = None
+        if METRICS_TEXTFILE:
+            METRICS.export_to(METRICS_TEXTFILE, METRICS_INTERVAL)
+
+    def close(self):
+        self.download_pool.shutdown(cancel_futures=True)
+        self.pdf_stage.shutdown()
+        tqdm.write(self.robots.summary())
+        tqdm.write(self.limiter.summary())
+        tqdm.write(self.pdf_store.summary())
+        self.pdf_store.close()
+        tqdm.write(self.memory_summary())
+        tqdm.write(METRICS.summary())
+        METRICS.close()
+
+    def memory_summary(self) -> str:
+        fmt = lambda n: "n/a" if n is None else f"{n / MB:.0f} MB"
+        return f"Peak RSS: Python {fmt(python_peak_rss())}, browser {fmt(self.browser_peak_rss)}"
+
+
+def _print_json(data: dict):
+    print(json.dumps(data), flush=True)
+
+
+def _copy_result(src: Future, dst: Future):
+    """Resolve `dst` like `src` once `src` is done."""
+    def done(f: Future):
+        if f.cancelled():
+            dst.cancel()
+        elif f.exception() is not None:
+            dst.set_exception(f.exception())
+        else:
+            dst.set_result(f.result())
+    src.add_done_callback(done)
+
+
+class _Crawl:
+    """Shared state for one crawl: the frontier and product counter.
+
+    Frontier bookkeeping runs on the event loop; page processing runs in worker
+    threads, so the product counter is guarded by `lock`; `writer` has its own.
+    """
+
+    def __init__(self, cfg: SiteConfig, limit: int, default_product_type: str = None, progress_json: bool = False,
+                 fetch_mode: str = FETCH_MODE, output_dir: str = None, writer: OutputWriter = None,
+                 frontier: str = FRONTIER, state: CrawlState = None, resume: bool = False,
+                 incremental: bool = False, shared: _Shared = None, position: int = None):
+        self.cfg = cfg
+        self.limit = limit
+        self.default_product_type = default_product_type
+        self.progress_json = progress_json
+        self.deny_patterns = (cfg.deny_patterns or []) + DENY_DEFAULT
+        self.shared = shared or _Shared()
+        self.limiter = self.shared.limiter
+        self.robots = self.shared.robots
+        self.fetcher = FetchStrategy(USER_AGENT, fetch_mode, limiter=self.limiter)
+        self.files_dir = os.path.join(output_dir or OUTPUT_DIR, "files")
+        self.writer = writer or OutputWriter(output_dir or OUTPUT_DIR)
+        self.pdf_store = self.shared.pdf_store
+        self.pdf_stage = self.shared.pdf_stage
+        # per run: each PDF URL is requested once however many product pages link it
+        self.downloader = PdfDownloader(self.pdf_store, self.http_get, self.shared.download_pool,
+                                        int(PDF_MAX_MB * 1024 * 1024))
+        self.parsing = {}
+        self.pdf_scan = {}
+        self.frontier_kind = frontier
+        if frontier == "bfs":
+            self.frontier = Frontier(FRONTIER_BLOOM_CAPACITY)
+        else:
+            scorer = LinkScorer(cfg.product_link_selectors, list(cfg.pdf_keywords) + PDF_WORDS)
+            self.frontier = PriorityFrontier(scorer, FRONTIER_BLOOM_CAPACITY)
+        self.in_flight = 0
+        # products counts claimed slots (checked against limit), saved counts rows written
+        self.products = 0
+        self.saved = 0
+        # rows written by an interrupted run this one resumes
+        self.saved_before = 0
+        # incremental crawls skip pages whose content did not change since the last run
+        self.incremental = incremental
+        self.unchanged_pages = 0
+        self.unchanged_products = 0
+        # near-duplicate product pages (regional paths, ?tab= variants, print views) by content fingerprint
+        self.duplicates = DuplicateIndex(DEDUPE_DISTANCE) if DEDUPE_DISTANCE >= 0 else None
+        self.finalizers = set()
+        self.lock = threading.Lock()
+        self.cond = asyncio.Condition()
+        self.elapsed = 0.0
+        # browser navigations per render profile: pages, seconds, bytes transferred, requests blocked
+        self.navigations = {}
+        # where --progress-json lines go (the warm worker streams them to the job's client instead)
+        self.emit = _print_json
+        self.pbar = tqdm(total=limit, desc=f"Crawling {cfg.manufacturer}", position=position)
+
+        self.state = state or CrawlState(os.path.join(output_dir or OUTPUT_DIR, "crawl_state.sqlite"),
+                                         before_commit=self.writer.flush)
+        site = json.dumps([cfg.manufacturer, cfg.start_urls])
+        self.resumed = (resume and self.state.get_meta("site") == site
+                        and self.state.get_meta("status") == "running")
+        if resume and not self.resumed:
+            tqdm.write("No interrupted crawl of this site to resume; starting from the start URLs")
+        if self.resumed:
+            for u in self.state.processed():
+                self.frontier.mark_seen(u)
+            for u, depth, anchor, from_product in self.state.pending():
+                self.frontier.push(u, depth, anchor, from_product)
+            self.products = self.saved = self.saved_before = int(self.state.get_meta("saved", "0"))
+            self.pbar.update(self.saved)
+        else:
+            self.state.reset_frontier()
+            if not incremental:
+                # incremental crawls skip unchanged canonical pages, so keep their fingerprints
+                self.state.reset_fingerprints()
+            self.state.set_meta("site", site)
+            self.state.set_meta("saved", 0)
+            for u in cfg.start_urls:
+                if self.frontier.push(u, 0):
+                    self.state.enqueue(u, 0)
+        self.state.set_meta("status", "running")
+        if self.duplicates is not None:
+            self.duplicates.load((u, Fingerprint(h, s)) for u, h, s in self.state.fingerprints())
+
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=8))
+    def http_get(self, url: str, headers: dict = None) -> requests.Response:
+        """GET for PDF downloads, retried and paced by the crawl's per-host limiter."""
+        delay = self.limiter.reserve(url)
+        METRICS.observe("rate_limit_wait", delay)
+        time.sleep(delay)
+        # streamed: the caller reads the body in chunks and closes the response
+        r = get_session(USER_AGENT).get(url, headers=headers, timeout=30, stream=True)
+        self.limiter.feedback(url, r.status_code, r.headers.get("Retry-After"))
+        if r.status_code >= 400:
+            r.close()
+        r.raise_for_status()
+        return r
 
+    def robots_ok(self, url: str) -> bool:
+        # runs in a thread: also loads the host's robots.txt rate into the limiter
+        with METRICS.timer("robots"):
+            self.limiter.interval(url)
+            return self.robots.allowed(self.cfg.base_url, url)
+
+    def unchanged(self, depth: int, prev):
+        """A page an incremental crawl found unchanged: reuse its stored links and skip extraction."""
+        METRICS.inc("pages_unchanged")
+        with self.lock:
+            self.unchanged_pages += 1
+            # unchanged products still use up the limit, so a refresh covers the same products
+            if prev.produced and self.products < self.limit:
+                self.products += 1
+                self.unchanged_products += 1
+                self.pbar.update(1)
+        return (list(prev.links) if depth < self.cfg.max_depth else []), None
+
+    def record_navigation(self, profile: str, seconds: float, nbytes: int, blocked: int):
+        nav = self.navigations.setdefault(profile, {"pages": 0, "seconds": 0.0, "bytes": 0, "blocked": 0})
+        nav["pages"] += 1
+        nav["seconds"] += seconds
+        nav["bytes"] += nbytes
+        nav["blocked"] += blocked
+
+    def pages_loaded(self) -> int:
+        return self.fetcher.counts["http"] + self.fetcher.counts["browser"]
+
+    def products_per_page(self) -> float:
+        return (self.saved - self.saved_before) / max(1, self.pages_loaded())
+
+    async def next_url(self):
+        async with self.cond:
+            while True:
+                if self.products >= self.limit:
+                    return None
+                item = self.frontier.pop()
+                if item is not None:
+                    self.in_flight += 1
+                    return item
+                if self.in_flight == 0:
+                    self.cond.notify_all()
+                    return None
+                await self.cond.wait()
+
+    async def release(self, url: str, new_links, depth: int, produced: bool = False, skipped: bool = False):
+        """Hand a visited page back to the frontier; `skipped` pages (not extracted) stay pending."""
+        async with self.cond:
+            if not skipped:
+                self.frontier.record(url, produced)
+            for nl, anchor in new_links:
+                if self.frontier.push(nl, depth + 1, anchor, produced):
+                    # queued links never trigger a commit, so this stays a quick insert
+                    self.state.enqueue(nl, depth + 1, anchor, produced)
+            self.in_flight -= 1
+            self.cond.notify_all()
+        if not produced and not skipped:
+            # product pages are checkpointed by `finalize` once their rows are written; off the event loop,
+            # since a checkpoint commit flushes the output files first
+            await _in_thread(self.state.done, url)
+
+    def process_page(self, url: str, html: str, depth: int, parsed: ParsedPage = None):
+        """Extract one fetched page and download its PDFs.
+
+        Returns (links to enqueue, pending product or None), or None when the
+        limit filled up before the page was extracted. PDF parsing is handed to
+        the extraction stage; the product row is written by `finalize` once
+        those results are in.
+        """
+        cfg = self.cfg
+        if self.products >= self.limit:
+            return None
+
+        if parsed is None:
+            with METRICS.timer("parse"):
+                parsed = parse_page(html, cfg.product_link_selectors)
+        page = parsed
+        # bounded text per page: product pages name their type and model well within PAGE_TEXT_LIMIT
+        title, text_blob = page.title, page.text[:PAGE_TEXT_LIMIT]
+        specs_html, pdf_links = page.specs, page.pdf_links
+
+        # Enqueue more links, with their anchor text as a hint for the priority frontier
+        new_links = []
+        if depth < cfg.max_depth:
+            anchors = dict(page.product_links)
+            for href in page.selected_links:
+                full = join_url(cfg.base_url, href)
+                if not is_denied(full, self.deny_patterns):
+                    new_links.append((full, anchors.get(href, "")))
+
+        # Product-looking pages duplicating one already crawled are only recorded as its alias
+        looks_like_product = bool(specs_html or pdf_links)
+        model_guess = guess_model(text_blob)
+        if looks_like_product and self.duplicates is not None:
+            with METRICS.timer("fingerprint"):
+                fp = fingerprint(text_blob, specs_html, model_guess, [href for href, _ in pdf_links])
+            match = self.duplicates.match_or_add(url, fp)
+            if match is not None:
+                METRICS.inc("pages_duplicate")
+                self.writer.write_alias(dict(zip(ALIAS_HEADERS, [cfg.manufacturer, url, *match])))
+                return new_links, None
+            self.state.record_fingerprint(url, *fp)
+        if not looks_like_product:
+            return new_links, None
+
+        # Claim a product slot before any PDF is downloaded or document row written, so a page
+        # turned away by the limit leaves nothing behind for the resume that crawls it again
+        with self.lock:
+            # another worker may have filled the limit while this page was processed
+            if self.products >= self.limit:
+                return None
+            self.products += 1
+        try:
+            product = self._extract_product(url, title, text_blob, specs_html, pdf_links, model_guess)
+        except Exception:
+            with self.lock:
+                self.products -= 1
+            raise
+        return new_links, product
+
+    def _extract_product(self, url: str, title: str, text_blob: str, specs_html, pdf_links, model_guess: str):
+        """Download a claimed product page's PDFs, write its document rows and queue their parsing."""
+        cfg = self.cfg
+        # Classify type (allow override); lazy PDF scans stop once this type's fields are covered
+        ptype = self.default_product_type or classify_product_type(title, url, text_blob)
+
+        # PDF docs: each entry is (sha256, cached kv dict or Future from the extraction stage)
+        pdf_results = []
+        docs = [(join_url(cfg.base_url, href), link_text) for href, link_text in pdf_links]
+        docs = [(pdf_url, link_text) for pdf_url, link_text in docs if self.robots.allowed(cfg.base_url, pdf_url)]
+        # all of the page's PDFs at once; None for failed, skipped (not a PDF, too large) ones
+        hashes = self.downloader.fetch_all([pdf_url for pdf_url, _ in docs]) if docs else []
+        for (pdf_url, link_text), h in zip(docs, hashes):
+            if h is None:
+                continue
+            fname = safe_filename(f"{cfg.manufacturer}_{h}.pdf")
             try:
-                page.goto(url, wait_until="load", timeout=45000)
-            except Exception:
+                self.pdf_store.link_into(h, os.path.join(self.files_dir, fname))
+            except OSError:
                 continue
 
-            html = page.content()
-            soup = BeautifulSoup(html, "lxml")
-            title = (soup.title.string if soup.title else "").strip()
-            text_blob = soup.get_text(" ")
+            # KV extraction is cached per blob across jobs; misses go to the process pool
+            key = (h, self.pdf_stage.variant(ptype))
+            with self.lock:
+                pdf_kv = self.parsing.get(key)
+                if pdf_kv is None:
+                    # reserve the blob before the cache lookup, so pages racing on it share one parse
+                    pdf_kv = self.parsing[key] = Future()
+                    owner = True
+                else:
+                    owner = False
+            if owner:
+                self._parse_pdf(key, pdf_kv, h, ptype)
+            pdf_results.append((key, pdf_kv))
 
-            product_links, specs_html, pdf_links = extract_links_and_specs(html, cfg.base_url)
-            # Merge raw specs from HTML + PDFs
-            raw_specs = dict(specs_html)
+            self.writer.write_document(dict(zip(DOC_HEADERS, [
+                cfg.manufacturer, url, link_text.strip(), fname, h, pdf_url
+            ])))
 
-            # PDF docs
-            for href, link_text in pdf_links:
-                pdf_url = join_url(cfg.base_url, href)
-                if not allowed(USER_AGENT, cfg.base_url, pdf_url):
-                    continue
+        # saved by `finalize` once its PDFs are parsed
+        return {
+            "url": url,
+            "title": title,
+            "model_guess": model_guess,
+            "product_type": ptype,
+            "specs_html": specs_html,
+            "pdf_results": pdf_results,
+        }
+
+    def _parse_pdf(self, key, reserved: Future, sha: str, ptype: str):
+        """Resolve `reserved` with (kv, scan stats, seconds), from the KV cache or the extraction stage."""
+        cached = self.pdf_store.get_kv(*key)
+        if cached is None:
+            try:
+                _copy_result(self.pdf_stage.submit(self.pdf_store.blob_path(sha), ptype), reserved)
+                return
+            except Exception:
+                cached = {}
+        # nothing for `finalize` to cache: drop the reservation so later pages read the cache
+        with self.lock:
+            self.parsing.pop(key, None)
+        reserved.set_result((cached, None, 0.0))
+
+    def finalize(self, product: dict):
+        """Merge PDF specs into a claimed product and write its rows."""
+        cfg = self.cfg
+        url, title, model_guess = product["url"], product["title"], product["model_guess"]
+        # Merge raw specs from HTML + PDFs
+        raw_specs = dict(product["specs_html"])
+        for key, pdf_kv in product["pdf_results"]:
+            if isinstance(pdf_kv, Future):
+                fut = pdf_kv
                 try:
-                    pdf_bytes = download_pdf(pdf_url)
+                    pdf_kv, scan, _ = fut.result()
                 except Exception:
                     continue
-                h = sha256_bytes(pdf_bytes)
-                fname = safe_filename(f"{cfg.manufacturer}_{h}.pdf")
-                out_path = os.path.join(OUTPUT_DIR, "files", fname)
-                ensure_dir(os.path.dirname(out_path))
-                with open(out_path, "wb") as f:
-                    f.write(pdf_bytes)
-
-                # Attempt KV extraction from PDF
-                try:
-                    pdf_kv = extract_kv_from_pdf(pdf_bytes)
-                    for k, v in pdf_kv.items():
-                        raw_specs.setdefault(k, v)
-                except Exception:
-                    pass
-
-                append_row(DOCS_CSV, dict(zip(DOC_HEADERS, [
-                    cfg.manufacturer, url, link_text.strip(), fname, h, pdf_url
-                ])))
-
-            # If the page looks like a product detail, save it
-            if raw_specs or pdf_links:
-                model_guess = guess_model(text_blob)
-                append_row(PRODUCTS_CSV, dict(zip(PRODUCT_HEADERS, [
-                    cfg.manufacturer, title, url, model_guess, json.dumps(raw_specs, ensure_ascii=False)
-                ])))
-                # Classify type (allow override)
-                ptype = default_product_type or classify_product_type(title, url, text_blob)
-                # Normalize
-                normalized = normalize_specs(raw_specs, ptype)
-                # Patch in a few universal fields
-                normalized_row = {
+                with self.lock:
+                    first = self.parsing.get(key) is fut
+                    if first and scan:
+                        for k, n in scan.items():
+                            self.pdf_scan[k] = self.pdf_scan.get(k, 0) + n
+                # results cut short by the time/page budget are not cached
+                if first and not (scan and scan["budget_stops"]):
+                    # cache before dropping the future so later pages never re-submit this PDF
+                    self.pdf_store.put_kv(*key, pdf_kv)
+                if first:
+                    with self.lock:
+                        self.parsing.pop(key, None)
+            for k, v in pdf_kv.items():
+                raw_specs.setdefault(k, v)
+
+        ptype = product["product_type"]
+        # Normalize
+        with METRICS.timer("normalize"):
+            normalized = normalize_specs(raw_specs, ptype)
+        # Patch in a few universal fields
+        normalized_row = {
+            "manufacturer": cfg.manufacturer,
+            "product_type": ptype,
+            "product_title": title,
+            "product_url": url,
+            "model": normalized.get("model") or model_guess or "",
+            "refrigerant": normalized.get("refrigerant"),
+            "capacity_ton": normalized.get("capacity_ton"),
+            "eer": normalized.get("eer"),
+            "ieer": normalized.get("ieer"),
+            "seer2": normalized.get("seer2"),
+            "power_supply": normalized.get("power_supply"),
+            "mca_a": normalized.get("mca_a"),
+            "mop_a": normalized.get("mop_a"),
+            "cfm": normalized.get("cfm"),
+            "esp_inwc": normalized.get("esp_inwc"),
+            "length_in": normalized.get("length_in"),
+            "width_in": normalized.get("width_in"),
+            "height_in": normalized.get("height_in"),
+            "weight_lb": normalized.get("weight_lb"),
+            "ahri_id": normalized.get("ahri_id"),
+        }
+
+        self.writer.write_product(dict(zip(PRODUCT_HEADERS, [
+            cfg.manufacturer, title, url, model_guess, json.dumps(raw_specs, ensure_ascii=False)
+        ])))
+        self.writer.write_normalized(normalized_row)
+        with self.lock:
+            self.saved += 1
+            self.state.done(url)
+            self.state.set_meta("saved", self.saved)
+            self.pbar.update(1)
+
+            # Output progress as JSON if requested
+            if self.progress_json:
+                progress_data = {
+                    "status": "running",
                     "manufacturer": cfg.manufacturer,
-                    "product_type": ptype,
-                    "product_title": title,
-                    "product_url": url,
-                    "model": normalized.get("model") or model_guess or "",
-                    "refrigerant": normalized.get("refrigerant"),
-                    "capacity_ton": normalized.get("capacity_ton"),
-                    "eer": normalized.get("eer"),
-                    "ieer": normalized.get("ieer"),
-                    "seer2": normalized.get("seer2"),
-                    "power_supply": normalized.get("power_supply"),
-                    "mca_a": normalized.get("mca_a"),
-                    "mop_a": normalized.get("mop_a"),
-                    "cfm": normalized.get("cfm"),
-                    "esp_inwc": normalized.get("esp_inwc"),
-                    "length_in": normalized.get("length_in"),
-                    "width_in": normalized.get("width_in"),
-                    "height_in": normalized.get("height_in"),
-                    "weight_lb": normalized.get("weight_lb"),
-                    "ahri_id": normalized.get("ahri_id"),
+                    "progress": int((self.saved / self.limit) * 100),
+                    "message": f"Found {self.saved} products so far...",
+                    "totalProducts": self.limit,
+                    "currentProduct": self.saved,
+                    "httpPages": self.fetcher.counts["http"],
+                    "browserPages": self.fetcher.counts["browser"],
+                    "frontierSize": len(self.frontier),
+                    "duplicatesDropped": self.frontier.duplicates,
+                    "duplicatePages": self.duplicates.duplicates if self.duplicates is not None else 0,
+                    "productsPerPage": round(self.products_per_page(), 3),
+                    "pdfDownloads": self.downloader.snapshot(),
+                    # process-wide stage timings (seconds), bytes fetched and errors by stage:type
+                    **METRICS.snapshot(),
                 }
-                append_normalized(normalized_row)
-                pbar.update(1)
-                
-                # Output progress as JSON if requested
-                if progress_json:
-                    progress_data = {
-                        "status": "running",
-                        "progress": int((pbar.n / limit) * 100),
-                        "message": f"Found {pbar.n} products so far...",
-                        "totalProducts": limit,
-                        "currentProduct": pbar.n
-                    }
-                    print(json.dumps(progress_data))
-
-            # Enqueue more links
-            if depth < cfg.max_depth:
-                new_links = []
-                for sel in cfg.product_link_selectors:
-                    anchors = page.query_selector_all(sel)
-                    for a in anchors:
-                        href = a.get_attribute("href")
-                        if not href:
-                            continue
-                        full = join_url(cfg.base_url, href)
-                        if full not in visited and not is_denied(full, deny_patterns):
-                            new_links.append(full)
-                for nl in new_links:
-                    queue.append((nl, depth + 1))
-
-            time.sleep(CRAWL_DELAY)
-
-        browser.close()
-        pbar.close()
+                self.emit(progress_data)
+
+
+class _Browser:
+    """Shared Chromium instance, launched on first use so HTTP-only crawls never load Playwright.
+
+    Every tab gets its own context, so recycling one frees its renderer memory.
+    `generation` is bumped when the browser processes exceed BROWSER_MAX_RSS_MB,
+    which tells every tab to recycle before its next navigation.
+    """
+
+    def __init__(self):
+        self.playwright = None
+        self.browser = None
+        self.generation = 0
+        self.navigations = 0
+        self.peak_rss = None
+        self._lock = asyncio.Lock()
+
+    async def start(self):
+        async with self._lock:
+            if self.browser is None:
+                from playwright.async_api import async_playwright
+                if self.playwright is None:
+                    self.playwright = await async_playwright().start()
+                self.browser = await self.playwright.chromium.launch(headless=True)
+
+    async def new_page(self):
+        """A page in a fresh context; returns (context, page)."""
+        await self.start()
+        context = await self.browser.new_context(user_agent=USER_AGENT)
+        return context, await context.new_page()
+
+    async def sample_rss(self):
+        if self.browser is None:
+            return None
+        rss = await asyncio.to_thread(browser_rss)
+        if rss is not None and (self.peak_rss is None or rss > self.peak_rss):
+            self.peak_rss = rss
+        return rss
+
+    async def check_memory(self):
+        """Called after each navigation; samples RSS every BROWSER_RSS_CHECK_PAGES of them."""
+        self.navigations += 1
+        if self.navigations % max(1, BROWSER_RSS_CHECK_PAGES):
+            return
+        rss = await self.sample_rss()
+        if BROWSER_MAX_RSS_MB > 0 and rss is not None and rss > BROWSER_MAX_RSS_MB * MB:
+            self.generation += 1
+            tqdm.write(f"Browser at {rss / MB:.0f} MB: recycling all browser contexts")
+
+    async def close(self):
+        if self.browser is not None:
+            await self.sample_rss()
+            await self.browser.close()
+            self.browser = None
+        if self.playwright is not None:
+            await self.playwright.stop()
+            self.playwright = None
+
+
+def _is_tracker(url: str) -> bool:
+    host = urlparse(url).hostname or ""
+    return any(host == t or host.endswith("." + t) for t in TRACKER_HOSTS)
+
+
+class _Tab:
+    """One worker's browser page, opened on its first navigation and reopened in a
+    fresh context after BROWSER_RECYCLE_PAGES navigations or an RSS-triggered recycle.
+
+    After each `fetch`, `last_nav` holds (seconds, bytes transferred, requests blocked).
+    """
+
+    def __init__(self, browser: _Browser, cfg: SiteConfig):
+        self.browser = browser
+        self.context = None
+        self.page = None
+        self.uses = 0
+        self.generation = 0
+        self.profile = cfg.render_profile or RENDER_PROFILE
+        self.wait_selector = cfg.wait_selector or ", ".join(
+            list(cfg.product_link_selectors) + ["table", "a[href$='.pdf']"]
+        )
+        self.blocked = 0
+        self.last_nav = (0.0, 0, 0)
+        self._sizes = []
+
+    async def _open(self):
+        self.context, self.page = await self.browser.new_page()
+        self.uses = 0
+        self.generation = self.browser.generation
+        self.page.on("requestfinished", self._finished)
+        if self.profile != "full":
+            await self.page.route("**/*", self._route)
+
+    async def _route(self, route):
+        request = route.request
+        if request.resource_type in BLOCKED_RESOURCE_TYPES or _is_tracker(request.url):
+            self.blocked += 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+    def _finished(self, request):
+        self._sizes.append(asyncio.ensure_future(request.sizes()))
+
+    async def fetch(self, url: str):
+        """Navigate to `url`; returns (html, HTTP status or None, Retry-After header or None)."""
+        if self.page is not None and (self.uses >= BROWSER_RECYCLE_PAGES > 0
+                                      or self.generation != self.browser.generation):
+            await self.close()
+        if self.page is None:
+            await self._open()
+        self.uses += 1
+        self._sizes = []
+        blocked = self.blocked
+        start = time.monotonic()
+        if self.profile == "full":
+            resp = await self.page.goto(url, wait_until="load", timeout=45000)
+        else:
+            resp = await self.page.goto(url, wait_until="domcontentloaded", timeout=45000)
+            try:
+                await self.page.wait_for_selector(self.wait_selector, state="attached", timeout=RENDER_WAIT_MS)
+            except Exception:
+                pass  # nothing matched in time: use what has rendered
+        html = await self.page.content()
+        seconds = time.monotonic() - start
+        sizes = await asyncio.gather(*self._sizes, return_exceptions=True)
+        nbytes = sum(max(0, s.get("responseBodySize", 0)) + max(0, s.get("responseHeadersSize", 0))
+                     for s in sizes if isinstance(s, dict))
+        self.last_nav = (seconds, nbytes, self.blocked - blocked)
+        METRICS.observe("navigate", seconds)
+        METRICS.inc("bytes_fetched", nbytes, source="browser")
+        await self.browser.check_memory()
+        if resp is None:
+            return html, None, None
+        return html, resp.status, resp.headers.get("retry-after")
+
+    async def close(self):
+        if self.context is not None:
+            try:
+                await self.context.close()
+            except Exception:
+                pass  # the browser is already gone
+        self.context = self.page = None
+
+
+async def _pace(crawl: _Crawl, url: str):
+    delay = crawl.limiter.reserve(url)
+    METRICS.observe("rate_limit_wait", delay)
+    await asyncio.sleep(delay)
+
+
+async def _in_thread(fn, *args):
+    """`asyncio.to_thread` that, when cancelled, still waits for `fn` to return.
+
+    A thread cannot be stopped, and page processing and `finalize` write to the
+    crawl state and outputs, which must not be closed under them.
+    """
+    fut = asyncio.ensure_future(asyncio.to_thread(fn, *args))
+    try:
+        return await asyncio.shield(fut)
+    except asyncio.CancelledError:
+        await asyncio.wait([fut])
+        raise
+
+
+async def _visit(crawl: _Crawl, tab: _Tab, url: str, depth: int):
+    """(links, pending product or None) for one URL.
+
+    None when the page was not extracted (the limit was reached first, or the
+    host kept answering 429/503): it stays pending for a later run or resume.
+    """
+    cfg = crawl.cfg
+    if not await asyncio.to_thread(crawl.robots_ok, url):
+        return [], None
+    if is_denied(url, crawl.deny_patterns):
+        return [], None
+
+    # Incremental crawls revalidate pages fetched by earlier runs
+    prev = await asyncio.to_thread(crawl.state.page, url) if crawl.incremental else None
+    headers = {}
+    if prev is not None:
+        if prev.etag:
+            headers["If-None-Match"] = prev.etag
+        if prev.last_modified:
+            headers["If-Modified-Since"] = prev.last_modified
+
+    # Plain HTTP first when the host serves usable HTML; the browser is the fallback
+    parsed = None
+    status = "fallback"
+    etag = last_modified = None
+    if crawl.fetcher.should_probe(url):
+        for _ in range(THROTTLE_RETRIES + 1):
+            # per-host politeness: wait for this host's next slot (longer after a 429/503)
+            await _pace(crawl, url)
+            res = await asyncio.to_thread(crawl.fetcher.probe, url, cfg.product_link_selectors, headers or None)
+            status, html, parsed, etag, last_modified = res
+            if status != "retry":
+                break
+        else:
+            # still throttled: HTTP-only crawls leave the page pending, the others try the browser
+            if crawl.fetcher.mode == "http":
+                return None
+            status = "fallback"
+    if status == "unchanged" and prev is not None:
+        return crawl.unchanged(depth, prev)
+    if status in ("skip", "unchanged"):
+        return [], None
+    if status == "fallback":
+        for _ in range(THROTTLE_RETRIES + 1):
+            await _pace(crawl, url)
+            try:
+                html, code, retry_after = await tab.fetch(url)
+            except Exception as e:
+                METRICS.error("navigate", e)
+                return [], None
+            crawl.record_navigation(tab.profile, *tab.last_nav)
+            if code is None:
+                break
+            crawl.limiter.feedback(url, code, retry_after)
+            if code not in crawl.limiter.THROTTLE_STATUSES:
+                break
+        else:
+            # a throttle page is not the product page: leave it pending instead of extracting it
+            return None
+        crawl.fetcher.record_browser()
+
+    # servers without validators: an identical body counts as unchanged too
+    content_hash = sha256_bytes(html.encode("utf-8"))
+    if prev is not None and prev.content_hash == content_hash:
+        return crawl.unchanged(depth, prev)
+    result = await _in_thread(crawl.process_page, url, html, depth, parsed)
+    if result is None:
+        # not extracted: recording it would make the next incremental run treat it as done
+        return None
+    new_links, product = result
+    crawl.state.record_page(url, content_hash, etag, last_modified, product is not None, new_links)
+    return new_links, product
+
+
+async def _finalize(crawl: _Crawl, product: dict):
+    pending = [asyncio.wrap_future(kv) for _, kv in product["pdf_results"] if isinstance(kv, Future)]
+    await asyncio.gather(*pending, return_exceptions=True)
+    await _in_thread(crawl.finalize, product)
+
+
+def _finalized(crawl: _Crawl, url: str, task: asyncio.Task):
+    """Done callback of a `_finalize` task: report the product it failed to save."""
+    crawl.finalizers.discard(task)
+    if task.cancelled() or task.exception() is None:
+        return
+    e = task.exception()
+    METRICS.error("finalize", e)
+    tqdm.write(f"{crawl.cfg.manufacturer}: product {url} not saved ({type(e).__name__}: {e})")
+
+
+async def _worker(crawl: _Crawl, browser: _Browser, gate: asyncio.Semaphore):
+    tab = _Tab(browser, crawl.cfg)
+    try:
+        while True:
+            item = await crawl.next_url()
+            if item is None:
+                break
+            url, depth = item
+            new_links, product, skipped = [], None, False
+            try:
+                # the gate caps pages (and their PDF downloads) in flight across all sites
+                async with gate:
+                    result = await _visit(crawl, tab, url, depth)
+                if result is None:
+                    skipped = True
+                else:
+                    new_links, product = result
+            except Exception as e:
+                METRICS.error("page", e)
+            finally:
+                await crawl.release(url, new_links, depth, product is not None, skipped)
+            if product is not None:
+                # keep navigating while the product's PDFs are parsed
+                task = asyncio.create_task(_finalize(crawl, product))
+                crawl.finalizers.add(task)
+                task.add_done_callback(functools.partial(_finalized, crawl, product["url"]))
+    finally:
+        await tab.close()
+
+
+async def _site(crawl: _Crawl, browser: _Browser, concurrency: int, gate: asyncio.Semaphore):
+    start = time.monotonic()
+    try:
+        await asyncio.gather(*(_worker(crawl, browser, gate) for _ in range(concurrency)))
+        # failures are reported by `_finalized` as each task ends
+        await asyncio.gather(*crawl.finalizers, return_exceptions=True)
+    finally:
+        # cancelled (e.g. a worker job's client went away): products still waiting for their PDFs stay
+        # pending for a resume; nothing may touch the state or outputs once the caller closes them
+        for task in crawl.finalizers:
+            task.cancel()
+        await asyncio.gather(*crawl.finalizers, return_exceptions=True)
+    crawl.elapsed = time.monotonic() - start
+
+
+async def _crawl(crawls, concurrency: int, max_in_flight: int = 0):
+    """Crawl every site in `crawls` with `concurrency` workers each, sharing one browser."""
+    concurrency = max(1, concurrency)
+    in_flight = concurrency * len(crawls)
+    if max_in_flight > 0:
+        in_flight = min(in_flight, max_in_flight)
+    gate = asyncio.Semaphore(in_flight)
+    # page processing (parsing, PDF downloads) runs in threads; size the pool to the pages in flight
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=in_flight + 4))
+    # every seed host's robots.txt at once, instead of each site waiting for its own on the first page
+    await asyncio.to_thread(crawls[0].robots.prefetch, [u for c in crawls for u in [c.cfg.base_url, *c.cfg.start_urls]])
+    browser = _Browser()
+    try:
+        await asyncio.gather(*(_site(crawl, browser, concurrency, gate) for crawl in crawls))
+    finally:
+        await browser.close()
+        crawls[0].shared.browser_peak_rss = browser.peak_rss
+
+
+def _open_crawl(cfg: SiteConfig, limit: int, default_product_type: str, output_dir: str, progress_json: bool,
+                fetch_mode: str, output_formats: str, frontier: str, resume: bool, incremental: bool,
+                shared: _Shared, state_path: str = None, position: int = None) -> _Crawl:
+    # job-specific results go to output_dir; the writer owns the files for this run only
+    formats = [f.strip() for f in (output_formats or OUTPUT_FORMATS).split(",") if f.strip()]
+    writer = OutputWriter(output_dir, formats, OUTPUT_BATCH_SIZE, OUTPUT_FLUSH_SECONDS)
+    state = CrawlState(state_path or os.path.join(output_dir, "crawl_state.sqlite"), before_commit=writer.flush)
+    return _Crawl(cfg, limit, default_product_type, progress_json, fetch_mode or FETCH_MODE, output_dir, writer,
+                  frontier or FRONTIER, state, resume, incremental, shared, position)
+
+
+def _close_crawl(crawl: _Crawl, completed: bool, incremental: bool):
+    if completed:
+        crawl.state.set_meta("status", "complete")
+    crawl.state.close()
+    crawl.writer.close()
+    crawl.pbar.close()
+    tqdm.write(f"{crawl.cfg.manufacturer}:")
+    if crawl.resumed:
+        tqdm.write(f"Resumed an interrupted crawl ({crawl.saved} products in total)")
+    if incremental:
+        tqdm.write(f"Incremental: {crawl.unchanged_pages} unchanged pages skipped "
+                   f"({crawl.unchanged_products} products unchanged)")
+    tqdm.write(crawl.fetcher.summary())
+    for profile, nav in crawl.navigations.items():
+        n = max(1, nav["pages"])
+        tqdm.write(f"Browser navigations ({profile}): {nav['pages']} pages, {nav['seconds'] / n:.2f}s and "
+                   f"{nav['bytes'] / n / 1024:.0f} KB per page, {nav['blocked']} requests blocked")
+    tqdm.write(crawl.downloader.summary())
+    tqdm.write(crawl.frontier.summary())
+    if crawl.duplicates is not None and crawl.duplicates.duplicates:
+        tqdm.write(f"Near-duplicates: {crawl.duplicates.duplicates} product pages recorded as aliases "
+                   f"(within {crawl.duplicates.max_distance} bits), their PDFs and normalization skipped")
+    tqdm.write(f"Products per page loaded: {crawl.products_per_page():.2f} "
+               f"({crawl.saved - crawl.saved_before} products / {crawl.pages_loaded()} pages, "
+               f"{crawl.frontier_kind} frontier)")
+    if crawl.pdf_scan:
+        sc = crawl.pdf_scan
+        tqdm.write(f"PDF scan: tables extracted from {sc['table_pages']} of {sc['pages']} pages "
+                   f"({sc['skipped_pages']} skipped, {sc['budget_stops']} documents hit the budget)")
+
+
+def summary_table(crawls) -> str:
+    """Per-site throughput of a batch run."""
+    header = ("Manufacturer", "Products", "Pages", "HTTP", "Browser", "Seconds", "Products/min", "Pages/s")
+    rows = []
+    for c in crawls:
+        products = c.saved - c.saved_before
+        secs = max(c.elapsed, 1e-9)
+        rows.append((c.cfg.manufacturer, str(products), str(c.pages_loaded()), str(c.fetcher.counts["http"]),
+                     str(c.fetcher.counts["browser"]), f"{c.elapsed:.1f}", f"{products * 60 / secs:.1f}",
+                     f"{c.pages_loaded() / secs:.2f}"))
+    widths = [max(len(r[i]) for r in [header] + rows) for i in range(len(header))]
+    fmt = lambda r: "  ".join(v.ljust(w) if i == 0 else v.rjust(w) for i, (v, w) in enumerate(zip(r, widths)))
+    return "\n".join([fmt(header), fmt(tuple("-" * w for w in widths))] + [fmt(r) for r in rows])
+
+
+def run(cfg: SiteConfig, limit: int, default_product_type: str = None, output_dir: str = None, progress_json: bool = False,
+        concurrency: int = None, fetch_mode: str = None, output_formats: str = None, frontier: str = None,
+        resume: bool = False, incremental: bool = False):
+    shared = _Shared()
+    crawl = _open_crawl(cfg, limit, default_product_type, output_dir or OUTPUT_DIR, progress_json, fetch_mode,
+                        output_formats, frontier, resume, incremental, shared,
+                        # a job's own output directory keeps its own state, so concurrent jobs never share one
+                        None if output_dir else CRAWL_STATE_PATH)
+    completed = False
+    try:
+        asyncio.run(_crawl([crawl], concurrency or CONCURRENCY))
+        completed = True
+    finally:
+        _close_crawl(crawl, completed, incremental)
+        shared.close()
+
+
+def load_seeds(paths) -> list:
+    """SiteConfigs from seed files and/or directories of *.json seeds."""
+    files = []
+    for path in paths:
+        files.extend(sorted(glob.glob(os.path.join(path, "*.json"))) if os.path.isdir(path) else [path])
+    cfgs = []
+    for fn in files:
+        with open(fn, "r", encoding="utf-8") as f:
+            cfgs.append(SiteConfig(**json.load(f)))
+    return cfgs
+
+
+def run_batch(cfgs, limit: int, default_product_type: str = None, output_dir: str = None, progress_json: bool = False,
+              concurrency: int = None, fetch_mode: str = None, output_formats: str = None, frontier: str = None,
+              resume: bool = False, incremental: bool = False, max_in_flight: int = None):
+    """Crawl several sites at once in this process: one browser, one PDF pool, one per-host limiter.
+
+    `limit` and `concurrency` apply per site; `max_in_flight` caps the pages being
+    fetched across all sites. Each manufacturer writes to its own `output_dir/<manufacturer>/`.
+    """
+    root = output_dir or OUTPUT_DIR
+    dirs = [os.path.join(root, safe_filename(cfg.manufacturer)) for cfg in cfgs]
+    if len(set(dirs)) != len(dirs):
+        raise SystemExit("Seeds must have distinct manufacturer names (each gets its own output directory)")
+    shared = _Shared()
+    crawls = [
+        _open_crawl(cfg, limit, default_product_type, d, progress_json, fetch_mode, output_formats, frontier,
+                    resume, incremental, shared, position=i)
+        for i, (cfg, d) in enumerate(zip(cfgs, dirs))
+    ]
+    completed = False
+    try:
+        asyncio.run(_crawl(crawls, concurrency or CONCURRENCY,
+                           BATCH_MAX_IN_FLIGHT if max_in_flight is None else max_in_flight))
+        completed = True
+    finally:
+        for crawl in crawls:
+            _close_crawl(crawl, completed, incremental)
+        shared.close()
+        tqdm.write(summary_table(crawls))
 
 if __name__ == "__main__":
     ap = argparse.ArgumentParser()
     ap.add_argument("--seed", help="Path to seed JSON file")
+    ap.add_argument("--seeds", nargs="+", metavar="PATH",
+                    help="Batch mode: seed files and/or directories of seeds (e.g. seeds/), crawled together")
     ap.add_argument("--url", help="Single start URL (no seed needed)")
     ap.add_argument("--manufacturer", help="Manufacturer name (required with --url)")
     ap.add_argument("--default_product_type", help="Force a product_type label for normalization")
     ap.add_argument("--limit", type=int, default=50, help="Max products to record")
     ap.add_argument("--output-dir", help="Custom output directory for job-specific results")
     ap.add_argument("--progress-json", action="store_true", help="Output progress as JSON")
+    ap.add_argument("--concurrency", type=int, default=CONCURRENCY,
+                    help="Number of pages crawled in parallel (per site in batch mode)")
+    ap.add_argument("--max-in-flight", type=int, default=BATCH_MAX_IN_FLIGHT,
+                    help="Batch mode: pages fetched at once across all sites")
+    ap.add_argument("--fetch", choices=["auto", "browser", "http"], default=FETCH_MODE,
+                    help="Fetch path: plain HTTP with browser fallback (auto), browser only, or HTTP only")
+    ap.add_argument("--format", default=OUTPUT_FORMATS,
+                    help="Comma-separated output formats: csv, jsonl, parquet (parquet needs pyarrow)")
+    ap.add_argument("--frontier", choices=["best", "bfs"], default=FRONTIER,
+                    help="Visit likely product pages first (best) or level by level (bfs)")
+    ap.add_argument("--resume", action="store_true", help="Continue the last interrupted crawl of this site")
+    ap.add_argument("--incremental", action="store_true",
+                    help="Revalidate pages from earlier runs and skip the unchanged ones")
     args = ap.parse_args()
 
     if args.url:
         if not args.manufacturer:
             raise SystemExit("--manufacturer is required when using --url")
         cfg = site_from_url(args.url, args.manufacturer)
-        run(cfg, args.limit, args.default_product_type, args.output_dir, args.progress_json)
+        run(cfg, args.limit, args.default_product_type, args.output_dir, args.progress_json, args.concurrency, args.fetch,
+            args.format, args.frontier, args.resume, args.incremental)
     elif args.seed:
         with open(args.seed, "r", encoding="utf-8") as f:
             cfg = SiteConfig(**json.load(f))
-        run(cfg, args.limit, args.default_product_type, args.output_dir, args.progress_json)
+        run(cfg, args.limit, args.default_product_type, args.output_dir, args.progress_json, args.concurrency, args.fetch,
+            args.format, args.frontier, args.resume, args.incremental)
+    elif args.seeds:
+        cfgs = load_seeds(args.seeds)
+        if not cfgs:
+            raise SystemExit("No seed files found")
+        run_batch(cfgs, args.limit, args.default_product_type, args.output_dir, args.progress_json, args.concurrency,
+                  args.fetch, args.format, args.frontier, args.resume, args.incremental, args.max_in_flight)
     else:
-        raise SystemExit("Provide either --url or --seed")
+        raise SystemExit("Provide either --url, --seed or --seeds")
@@ -0,0 +1,165 @@
+import json
+import sqlite3
+import threading
+import time
+from typing import Callable, Iterator, List, NamedTuple, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS frontier (
+    url TEXT PRIMARY KEY,
+    depth INTEGER NOT NULL,
+    anchor TEXT NOT NULL DEFAULT '',
+    from_product INTEGER NOT NULL DEFAULT 0,
+    done INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    produced INTEGER NOT NULL,
+    links_json TEXT NOT NULL,
+    checked_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS fingerprints (
+    url TEXT PRIMARY KEY,
+    simhash TEXT NOT NULL,
+    specs TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class PageRecord(NamedTuple):
+    content_hash: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    produced: bool
+    links: List[Tuple[str, str]]
+
+
+class CrawlState:
+    """Checkpointed crawl state in one SQLite file, normally `<output_dir>/crawl_state.sqlite`.
+
+    `frontier` holds every queued URL of the current crawl and whether it was
+    processed, so `--resume` can requeue the rest. `pages` outlives crawls: the
+    content hash, ETag/Last-Modified and links of each fetched page let an
+    incremental crawl send conditional requests and skip unchanged pages.
+    `fingerprints` holds the content fingerprints of the crawl's product pages,
+    so a resumed or incremental crawl still recognises their near-duplicates.
+    Writes are committed every `commit_every` checkpoints (pages done or
+    recorded, meta updates) or `commit_seconds`, and by `close()`; a crash loses
+    at most that window, whose pages are fetched again. Queued links ride along
+    with the next commit. When pages were marked done since the last commit,
+    `before_commit` (e.g. `OutputWriter.flush`) runs first, so their rows are on
+    disk before the checkpoint says so.
+    """
+
+    def __init__(self, path: str, commit_every: int = 50, commit_seconds: float = 5.0,
+                 before_commit: Callable[[], None] = None):
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self.commit_every = commit_every
+        self.commit_seconds = commit_seconds
+        self.before_commit = before_commit
+        self._dirty = 0
+        self._pages_done = False
+        self._last_commit = time.monotonic()
+
+    def _write(self, sql: str, args: tuple, checkpoint: bool = True):
+        with self._lock:
+            self._db.execute(sql, args)
+            if not checkpoint:
+                return
+            self._dirty += 1
+            if self._dirty >= self.commit_every or time.monotonic() - self._last_commit >= self.commit_seconds:
+                self._commit()
+
+    def _commit(self):
+        if self.before_commit is not None and self._pages_done:
+            self.before_commit()
+        self._db.commit()
+        self._dirty = 0
+        self._pages_done = False
+        self._last_commit = time.monotonic()
+
+    def get_meta(self, key: str, default: str = None) -> Optional[str]:
+        with self._lock:
+            row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key: str, value):
+        self._write("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+    def reset_frontier(self):
+        with self._lock:
+            self._db.execute("DELETE FROM frontier")
+            self._commit()
+
+    def enqueue(self, url: str, depth: int, anchor: str = "", from_product: bool = False):
+        # not a checkpoint: a hub page queues hundreds of links, which must not each count toward a commit
+        self._write(
+            "INSERT OR IGNORE INTO frontier (url, depth, anchor, from_product) VALUES (?, ?, ?, ?)",
+            (url, depth, anchor or "", int(from_product)), checkpoint=False,
+        )
+
+    def done(self, url: str):
+        with self._lock:
+            self._pages_done = True
+        self._write("UPDATE frontier SET done = 1 WHERE url = ?", (url,))
+
+    def pending(self) -> Iterator[Tuple[str, int, str, bool]]:
+        """Queued URLs not processed yet, in the order they were queued."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT url, depth, anchor, from_product FROM frontier WHERE done = 0 ORDER BY rowid"
+            ).fetchall()
+        return ((u, d, a, bool(p)) for u, d, a, p in rows)
+
+    def processed(self) -> Iterator[str]:
+        with self._lock:
+            rows = self._db.execute("SELECT url FROM frontier WHERE done = 1").fetchall()
+        return (r[0] for r in rows)
+
+    def page(self, url: str) -> Optional[PageRecord]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT content_hash, etag, last_modified, produced, links_json FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        return PageRecord(row[0], row[1], row[2], bool(row[3]), [tuple(link) for link in json.loads(row[4])])
+
+    def record_page(self, url: str, content_hash: str, etag: Optional[str], last_modified: Optional[str],
+                    produced: bool, links: List[Tuple[str, str]]):
+        self._write(
+            "INSERT OR REPLACE INTO pages (url, content_hash, etag, last_modified, produced, links_json, checked_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (url, content_hash, etag, last_modified, int(produced), json.dumps(links, ensure_ascii=False), time.time()),
+        )
+
+    def reset_fingerprints(self):
+        with self._lock:
+            self._db.execute("DELETE FROM fingerprints")
+            self._commit()
+
+    def record_fingerprint(self, url: str, simhash: int, specs: str):
+        # hex: SQLite integers are signed 64-bit
+        self._write("INSERT OR REPLACE INTO fingerprints (url, simhash, specs) VALUES (?, ?, ?)",
+                    (url, f"{simhash:016x}", specs))
+
+    def fingerprints(self) -> Iterator[Tuple[str, int, str]]:
+        with self._lock:
+            rows = self._db.execute("SELECT url, simhash, specs FROM fingerprints").fetchall()
+        return ((u, int(h, 16), s) for u, h, s in rows)
+
+    def close(self):
+        with self._lock:
+            self._commit()
+            self._db.close()
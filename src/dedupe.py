@@ -0,0 +1,117 @@
+import hashlib
+import json
+import re
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, NamedTuple, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+_WORD = re.compile(r"\w+")
+# Words per shingle: long enough that boilerplate order matters, short enough to survive small edits
+SHINGLE = 3
+
+
+class Fingerprint(NamedTuple):
+    simhash: int
+    specs: str
+
+
+# byte -> 1 if bit k is set, else 0: bytes.translate + count tallies one bit of many hashes in C
+_BIT = [bytes((b >> k) & 1 for b in range(256)) for k in range(8)]
+
+
+def _hash64(s: str) -> bytes:
+    """64-bit hash of `s`, little-endian: byte j holds bits 8j..8j+7."""
+    return hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest()
+
+
+def simhash(text: str) -> int:
+    """64-bit simhash of `text` over word shingles weighted by count.
+
+    Pages differing in a few words (a region switcher, a print button, the
+    tab's heading) land a few bits apart; unrelated pages about 32.
+    """
+    words = _WORD.findall(text.lower())
+    if len(words) < SHINGLE:
+        shingles = Counter([" ".join(words)])
+    else:
+        shingles = Counter(" ".join(words[i:i + SHINGLE]) for i in range(len(words) - SHINGLE + 1))
+    # each shingle's hash repeated by its count, so bit tallies are weighted
+    hashes = b"".join(_hash64(s) * n for s, n in shingles.items())
+    total = len(hashes) // 8
+    h = 0
+    for j in range(8):
+        column = hashes[j::8]
+        for k in range(8):
+            # a bit is set when more than half of the weighted shingles set it
+            if 2 * column.translate(_BIT[k]).count(1) > total:
+                h |= 1 << (8 * j + k)
+    return h
+
+
+def specs_digest(specs: Dict[str, str], model: str = "", pdf_hrefs: Sequence[str] = ()) -> str:
+    """Hash of the extracted spec table, model and linked PDF file names.
+
+    Ignores case, spacing and row order; PDFs count by file name, so regional
+    copies linking /eu/docs/x.pdf and /docs/x.pdf still agree.
+    """
+    norm = lambda s: " ".join(str(s).lower().split())
+    items = sorted((norm(k), norm(v)) for k, v in specs.items())
+    docs = sorted({urlsplit(h).path.rsplit("/", 1)[-1].lower() for h in pdf_hrefs})
+    return hashlib.blake2b(json.dumps([norm(model), items, docs]).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def fingerprint(text: str, specs: Dict[str, str], model: str = "", pdf_hrefs: Sequence[str] = ()) -> Fingerprint:
+    return Fingerprint(simhash(text), specs_digest(specs, model, pdf_hrefs))
+
+
+class DuplicateIndex:
+    """Fingerprints of the product pages of one crawl, looked up by simhash band.
+
+    A page is a near-duplicate of an indexed one when their spec digests are
+    equal (same specs, model and PDFs) and their simhashes differ in at most
+    `max_distance` bits. The 64 bits are split into `max_distance + 1` bands,
+    so any such pair shares at least one band exactly and only pages in the
+    same band buckets are compared.
+    """
+
+    def __init__(self, max_distance: int = 3):
+        self.max_distance = max_distance
+        bands = max_distance + 1
+        self._bands = [(i * 64 // bands, (i + 1) * 64 // bands) for i in range(bands)]
+        self._buckets = defaultdict(list)
+        self._lock = threading.Lock()
+        self.duplicates = 0
+
+    def _keys(self, h: int):
+        return [(i, (h >> lo) & ((1 << (hi - lo)) - 1)) for i, (lo, hi) in enumerate(self._bands)]
+
+    def _add(self, url: str, fp: Fingerprint):
+        for key in self._keys(fp.simhash):
+            self._buckets[key].append((fp, url))
+
+    def load(self, items: Iterable[Tuple[str, Fingerprint]]):
+        with self._lock:
+            for url, fp in items:
+                self._add(url, fp)
+
+    def match_or_add(self, url: str, fp: Fingerprint) -> Optional[Tuple[str, int]]:
+        """(canonical URL, bit distance) when `fp` duplicates an indexed page, else index it and return None.
+
+        Check and insert happen under one lock, so of two copies fetched at once
+        exactly one becomes the canonical page.
+        """
+        with self._lock:
+            best = None
+            for key in self._keys(fp.simhash):
+                for other, other_url in self._buckets.get(key, ()):
+                    if other_url == url or other.specs != fp.specs:
+                        continue
+                    distance = (other.simhash ^ fp.simhash).bit_count()
+                    if distance <= self.max_distance and (best is None or distance < best[1]):
+                        best = (other_url, distance)
+            if best is not None:
+                self.duplicates += 1
+                return best
+            self._add(url, fp)
+            return None
@@ -0,0 +1,145 @@
+import re
+import threading
+from collections import defaultdict
+from typing import Dict, NamedTuple, Optional, Sequence
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .html_parser import ParsedPage, parse_page
+from .metrics import METRICS
+
+# Markers of client-rendered apps whose raw HTML is an empty shell
+SPA_MARKERS = [
+    re.compile(r'<div[^>]+id=["\'](root|app|__next|__nuxt)["\'][^>]*>\s*</div>', re.I),
+    re.compile(r"<app-root", re.I),
+    re.compile(r"\bng-app\b|\bng-version=", re.I),
+    re.compile(r"<noscript>[^<]*enable javascript", re.I),
+]
+
+# A host is switched to browser-only once this many HTTP probes fell back
+# and fallbacks outnumber HTTP successes
+PROBE_LIMIT = 3
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_session(user_agent: str = None, pool_size: int = 16) -> requests.Session:
+    """Process-wide `requests.Session` with a connection pool per host."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            s = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            s.mount("http://", adapter)
+            s.mount("https://", adapter)
+            _session = s
+        if user_agent:
+            _session.headers["User-Agent"] = user_agent
+        return _session
+
+
+class ProbeResult(NamedTuple):
+    status: str
+    html: Optional[str] = None
+    parsed: Optional[ParsedPage] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+def looks_js_rendered(html: str, product_links, specs, pdf_links) -> bool:
+    if not product_links and not specs and not pdf_links:
+        return True
+    if "<table" not in html.lower() and any(p.search(html) for p in SPA_MARKERS):
+        return True
+    return False
+
+
+class FetchStrategy:
+    """Picks plain HTTP or Playwright per URL and learns which one each host needs.
+
+    `mode` is "auto" (probe with HTTP, escalate to the browser when the raw HTML
+    looks JS-rendered), "http" (never launch a navigation) or "browser" (always
+    navigate, the pre-fast-path behaviour).
+    """
+
+    def __init__(self, user_agent: str, mode: str = "auto", timeout: float = 30, limiter=None):
+        self.user_agent = user_agent
+        self.mode = mode
+        self.timeout = timeout
+        # AdaptiveRateLimiter told about every response status
+        self.limiter = limiter
+        self.session = get_session(user_agent)
+        self._hosts: Dict[str, Dict[str, int]] = defaultdict(lambda: {"http": 0, "fallback": 0})
+        self._lock = threading.Lock()
+        self.counts = {"http": 0, "browser": 0, "fallback": 0}
+
+    def should_probe(self, url: str) -> bool:
+        if self.mode != "auto":
+            return self.mode == "http"
+        stats = self._hosts[urlparse(url).netloc]
+        return not (stats["fallback"] >= PROBE_LIMIT and stats["fallback"] > stats["http"])
+
+    def probe(self, url: str, link_selectors: Sequence[str] = (), headers: Dict[str, str] = None) -> ProbeResult:
+        """Fetch `url` over HTTP.
+
+        The result's status is "ok" (use the HTML and its `parse_page` result),
+        "unchanged" (304 for conditional `headers`), "fallback" (navigate with
+        the browser), "retry" (the host answered 429/503; wait for the limiter
+        and try again) or "skip" (not an HTML page, nothing to crawl).
+        """
+        try:
+            with METRICS.timer("http_fetch"):
+                r = self.session.get(url, headers=headers, timeout=self.timeout, stream=True)
+                try:
+                    if self.limiter is not None:
+                        self.limiter.feedback(url, r.status_code, r.headers.get("Retry-After"))
+                    if r.status_code in (429, 503):
+                        return ProbeResult("retry")
+                    r.raise_for_status()
+                    ctype = r.headers.get("Content-Type", "").lower()
+                    # streamed: PDFs and other files linked like pages are dropped before their body is read
+                    if r.status_code == 304 or (ctype and "html" not in ctype):
+                        html = None
+                    else:
+                        html = r.text
+                        METRICS.inc("bytes_fetched", len(r.content), source="http")
+                finally:
+                    r.close()
+        except Exception as e:
+            METRICS.error("http_fetch", e)
+            return self._fallback(url)
+        if r.status_code == 304:
+            self._count_http(url)
+            return ProbeResult("unchanged")
+        if html is None:
+            return ProbeResult("skip")
+        with METRICS.timer("parse"):
+            parsed = parse_page(html, link_selectors)
+        if self.mode == "auto" and looks_js_rendered(html, parsed.product_links, parsed.specs, parsed.pdf_links):
+            return self._fallback(url)
+        self._count_http(url)
+        return ProbeResult("ok", html, parsed, r.headers.get("ETag"), r.headers.get("Last-Modified"))
+
+    def _count_http(self, url: str):
+        with self._lock:
+            self._hosts[urlparse(url).netloc]["http"] += 1
+            self.counts["http"] += 1
+
+    def _fallback(self, url: str) -> ProbeResult:
+        if self.mode == "http":
+            return ProbeResult("skip")
+        with self._lock:
+            self._hosts[urlparse(url).netloc]["fallback"] += 1
+            self.counts["fallback"] += 1
+        return ProbeResult("fallback")
+
+    def record_browser(self):
+        with self._lock:
+            self.counts["browser"] += 1
+
+    def summary(self) -> str:
+        c = self.counts
+        return f"Fetched {c['http']} pages over HTTP, {c['browser']} with the browser ({c['fallback']} HTTP probes escalated)"
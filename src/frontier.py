@@ -0,0 +1,232 @@
+import hashlib
+import heapq
+import itertools
+import math
+import re
+from collections import defaultdict, deque
+from typing import Optional, Sequence, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only track the visit and never change the page
+TRACKING_PARAMS = {"gclid", "fbclid", "msclkid", "mc_cid", "mc_eid", "_ga", "_gl", "_hsenc", "_hsmi", "yclid"}
+DEFAULT_PORTS = {"http": "80", "https": "443"}
+
+# href attribute tests in CSS selectors, e.g. a[href*='/products/']
+_HREF_TEST = re.compile(r"""href\s*([*^$]?)=\s*["']([^"']+)["']""")
+_MODEL_LIKE = re.compile(r"\b(?=[A-Z0-9-]*\d)(?=[A-Z0-9-]*[A-Z])[A-Z0-9][A-Z0-9-]{2,}\b")
+_SEGMENT_ID = re.compile(r"\d+")
+
+
+def canonicalize(url: str) -> str:
+    """Key under which a URL is deduplicated.
+
+    Lowercases scheme and host, drops default ports, fragments, utm_* and other
+    tracking parameters and ;jsessionid path parameters, sorts the remaining
+    query and ignores a trailing slash (except for the root path). Raises
+    ValueError for URLs that cannot be split, e.g. a port that is not a number.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and str(parts.port) != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    path = parts.path.split(";jsessionid=", 1)[0] or "/"
+    if len(path) > 1:
+        path = path.rstrip("/") or "/"
+    query = [
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS
+    ]
+    return urlunsplit((scheme, host, path, urlencode(sorted(query)), ""))
+
+
+class BloomFilter:
+    """Fixed-size probabilistic set: no false negatives, about `error_rate` false positives
+    once `capacity` items are added. Takes ~2.4 bytes per item at 1e-4 instead of a
+    full URL string."""
+
+    def __init__(self, capacity: int, error_rate: float = 1e-4):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        d = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(d[:8], "little")
+        h2 = int.from_bytes(d[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, key: str):
+        for p in self._positions(key):
+            self.bits[p >> 3] |= 1 << (p & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[p >> 3] & (1 << (p & 7)) for p in self._positions(key))
+
+
+class Frontier:
+    """FIFO crawl frontier that deduplicates canonical URLs when they are enqueued.
+
+    A URL is marked seen on its first `push`, so hub pages linking the same
+    products thousands of times add each one once. `bloom_capacity` > 0 swaps the
+    exact seen-set for a `BloomFilter` sized for that many URLs; a false positive
+    then skips an unseen URL with probability `bloom_error`.
+    """
+
+    def __init__(self, bloom_capacity: int = 0, bloom_error: float = 1e-4):
+        self._queue = deque()
+        self._seen = BloomFilter(bloom_capacity, bloom_error) if bloom_capacity > 0 else set()
+        self.enqueued = 0
+        self.duplicates = 0
+        self.invalid = 0
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    @staticmethod
+    def _key(url: str) -> Optional[str]:
+        try:
+            return canonicalize(url)
+        except ValueError:
+            return None  # malformed link (bad port, broken IPv6 host): never crawlable
+
+    def mark_seen(self, url: str):
+        """Never queue `url`, e.g. because a resumed crawl already processed it."""
+        key = self._key(url)
+        if key is not None:
+            self._seen.add(key)
+
+    def _mark(self, url: str) -> bool:
+        key = self._key(url)
+        if key is None:
+            self.invalid += 1
+            return False
+        if key in self._seen:
+            self.duplicates += 1
+            return False
+        self._seen.add(key)
+        self.enqueued += 1
+        return True
+
+    def push(self, url: str, depth: int = 0, anchor: str = "", from_product: bool = False) -> bool:
+        """Queue `url` unless its canonical form was seen before or it is malformed; returns whether it was added.
+
+        `anchor` and `from_product` are hints for `PriorityFrontier`; FIFO order ignores them.
+        """
+        if not self._mark(url):
+            return False
+        self._queue.append((url, depth))
+        return True
+
+    def record(self, url: str, produced: bool):
+        """Feedback after a page was processed; only used by `PriorityFrontier`."""
+
+    def pop(self) -> Optional[Tuple[str, int]]:
+        if not self._queue:
+            return None
+        return self._queue.popleft()
+
+    def summary(self) -> str:
+        return (f"Frontier: {self.enqueued} URLs queued, {self.duplicates} duplicate links dropped, "
+                f"{self.invalid} malformed links dropped, {len(self)} left unvisited")
+
+
+class LinkScorer:
+    """Scores candidate links by how likely they lead to a product detail page.
+
+    Static signals come from the link itself: href tests in `product_link_selectors`
+    the URL matches, spec/PDF keywords in the anchor text or URL, a model-number-like
+    anchor, whether the linking page was a product page, and depth. The learned signal
+    is the smoothed share of pages with each URL shape (host + path with the last
+    segment and numbers generalized) that produced a product so far on this crawl.
+    """
+
+    SHAPE_WEIGHT = 3.0
+    DEPTH_PENALTY = 0.25
+
+    def __init__(self, link_selectors: Sequence[str] = (), keywords: Sequence[str] = ()):
+        self.tests = [m.groups() for sel in link_selectors for m in _HREF_TEST.finditer(sel)]
+        self.keywords = tuple(k.lower() for k in keywords if k)
+        self.shapes = defaultdict(lambda: [0, 0])  # shape -> [products, pages]
+
+    @staticmethod
+    def shape(url: str) -> str:
+        parts = urlsplit(url)
+        segments = [s for s in parts.path.split("/") if s]
+        head = "/".join(_SEGMENT_ID.sub("#", s) for s in segments[:-1])
+        return f"{parts.netloc.lower()}/{head}/*{len(segments)}"
+
+    def _matches(self, url: str) -> int:
+        n = 0
+        for op, value in self.tests:
+            if value.lower().endswith(".pdf"):
+                continue
+            if ((op == "*" and value in url) or (op == "^" and url.startswith(value))
+                    or (op == "$" and url.endswith(value)) or (op == "" and url == value)):
+                n += 1
+        return n
+
+    def static_score(self, url: str, depth: int, anchor: str = "", from_product: bool = False) -> float:
+        low = url.lower()
+        if urlsplit(low).path.endswith(".pdf"):
+            # PDFs are downloaded from product pages, never crawled as pages
+            return -5.0
+        score = min(self._matches(url), 2) * 0.5
+        text = f"{anchor.lower()} {low}"
+        if any(k in text for k in self.keywords):
+            score += 1.0
+        if anchor and _MODEL_LIKE.search(anchor):
+            score += 0.5
+        if from_product:
+            score += 0.5
+        return score - self.DEPTH_PENALTY * depth
+
+    def shape_rate(self, shape: str) -> float:
+        products, pages = self.shapes.get(shape, (0, 0))
+        return (products + 1) / (pages + 2)
+
+    def record(self, url: str, produced: bool):
+        stats = self.shapes[self.shape(url)]
+        stats[0] += int(produced)
+        stats[1] += 1
+
+
+class PriorityFrontier(Frontier):
+    """Best-first frontier: pops the link with the highest `LinkScorer` score.
+
+    Shape rates change as pages come back, so a popped entry is rescored and put
+    back if it no longer beats the next one (lazy update; ties keep FIFO order).
+    """
+
+    def __init__(self, scorer: LinkScorer, bloom_capacity: int = 0, bloom_error: float = 1e-4):
+        super().__init__(bloom_capacity, bloom_error)
+        self.scorer = scorer
+        self._heap = []
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def _score(self, static: float, shape: str) -> float:
+        return static + self.scorer.SHAPE_WEIGHT * self.scorer.shape_rate(shape)
+
+    def push(self, url: str, depth: int = 0, anchor: str = "", from_product: bool = False) -> bool:
+        if not self._mark(url):
+            return False
+        static = self.scorer.static_score(url, depth, anchor, from_product)
+        shape = self.scorer.shape(url)
+        heapq.heappush(self._heap, (-self._score(static, shape), next(self._seq), url, depth, static, shape))
+        return True
+
+    def pop(self) -> Optional[Tuple[str, int]]:
+        while self._heap:
+            neg, seq, url, depth, static, shape = heapq.heappop(self._heap)
+            current = -self._score(static, shape)
+            if self._heap and current > self._heap[0][0] + 1e-9:
+                heapq.heappush(self._heap, (current, seq, url, depth, static, shape))
+                continue
+            return url, depth
+        return None
+
+    def record(self, url: str, produced: bool):
+        self.scorer.record(url, produced)
@@ -1,7 +1,11 @@
-from bs4 import BeautifulSoup
-from typing import Dict, List, Tuple
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Sequence, Tuple
 import re
 
+import lxml.html
+from lxml import etree
+from lxml.cssselect import CSSSelector
+
 SPEC_HEADERS_HINTS = [
     "spec", "specification", "performance", "technical"
 ]
@@ -10,6 +14,94 @@ PDF_WORDS = ["submittal", "spec", "specification", "catalog", "i&o", "iom", "man
 
 MODEL_PAT = re.compile(r"Model\s*[:#]?\s*([A-Z0-9\-\/\.]+)", re.I)
 
+HEADING_TAGS = {"h1", "h2", "h3"}
+
+# Text nodes as BeautifulSoup's get_text() sees them: script/style/template content and comments excluded
+_TEXT = etree.XPath(".//text()[not(ancestor::script or ancestor::style or ancestor::template)]", smart_strings=False)
+
+
+class ParsedPage(NamedTuple):
+    title: str
+    text: str
+    product_links: List[Tuple[str, str]]
+    specs: Dict[str, str]
+    pdf_links: List[Tuple[str, str]]
+    selected_links: List[str]
+
+
+@lru_cache(maxsize=256)
+def _selector(css: str) -> CSSSelector:
+    return CSSSelector(css, translator="html")
+
+
+def _text(el, sep: str = "") -> str:
+    return sep.join(_TEXT(el))
+
+
+def _parse_tree(html: str):
+    try:
+        return lxml.html.document_fromstring(html)
+    except ValueError:
+        # str input with an XML encoding declaration (XHTML pages)
+        return lxml.html.document_fromstring(html.encode("utf-8"))
+    except etree.ParserError:
+        return None
+
+
+def parse_page(html: str, link_selectors: Sequence[str] = ()) -> ParsedPage:
+    """Parse a page once and extract everything the crawler needs from it.
+
+    title/text: page title and the whole visible text (space separated)
+    product_links: list of (href, text) for every anchor with both
+    specs: simple key/value map from 2-col tables under a spec-like heading
+    pdf_links: list of (href, link_text) for .pdf anchors mentioning PDF_WORDS
+    selected_links: raw hrefs of elements matching `link_selectors`, in selector order
+    """
+    root = _parse_tree(html) if html and html.strip() else None
+    if root is None:
+        return ParsedPage("", "", [], {}, [], [])
+
+    title = ""
+    product_links = []
+    pdf_links = []
+    specs = {}
+    last_heading = None
+    # single forward walk: the nearest heading before each table is the last one seen
+    for el in root.iter("title", "h1", "h2", "h3", "table", "a"):
+        tag = el.tag
+        if tag == "a":
+            href = el.get("href")
+            text = _text(el).strip()
+            if href and text:
+                product_links.append((href, text))
+            if href and href.endswith(".pdf"):
+                if any(w in text.lower() for w in PDF_WORDS):
+                    pdf_links.append((href, "".join(s.strip() for s in _TEXT(el))))
+        elif tag in HEADING_TAGS:
+            last_heading = el
+        elif tag == "table":
+            # quick check: does the table live near a header with spec-like text?
+            header_text = _text(last_heading, " ").lower() if last_heading is not None else ""
+            if any(h in header_text for h in SPEC_HEADERS_HINTS):
+                for tr in el.iter("tr"):
+                    tds = list(tr.iter("td", "th"))
+                    if len(tds) == 2:
+                        k = _text(tds[0], " ").strip()
+                        v = _text(tds[1], " ").strip()
+                        if k and v:
+                            specs[k] = v
+        elif tag == "title" and not title:
+            title = _text(el).strip()
+
+    selected_links = []
+    for sel in link_selectors:
+        for a in _selector(sel)(root):
+            href = a.get("href")
+            if href:
+                selected_links.append(href)
+
+    return ParsedPage(title, _text(root, " "), product_links, specs, pdf_links, selected_links)
+
 
 def extract_links_and_specs(html: str, base_url: str) -> Tuple[List[Tuple[str,str]], Dict[str,str], List[Tuple[str,str]]]:
     """
@@ -18,41 +110,10 @@ def extract_links_and_specs(html: str, base_url: str) -> Tuple[List[Tuple[str,st
     specs_kv: simple key/value map from 2-col tables (best effort)
     pdf_links: list of (href, link_text)
     """
-    soup = BeautifulSoup(html, "lxml")
-
-    # product links
-    product_links = []
-    for a in soup.select("a"):
-        href = a.get("href")
-        text = (a.get_text() or "").strip()
-        if href and text:
-            product_links.append((href, text))
-
-    # spec tables (very simple two-column tables)
-    specs = {}
-    for table in soup.select("table"):
-        # quick check: does the table live near a header with spec-like text?
-        header_text = " ".join(h.get_text(" ").lower() for h in table.find_all_previous(["h1","h2","h3"], limit=1))
-        if any(h in header_text for h in SPEC_HEADERS_HINTS):
-            for tr in table.select("tr"):
-                tds = tr.find_all(["td","th"])
-                if len(tds) == 2:
-                    k = tds[0].get_text(" ").strip()
-                    v = tds[1].get_text(" ").strip()
-                    if k and v:
-                        specs[k] = v
-
-    # pdf links
-    pdf_links = []
-    for a in soup.select("a[href$='.pdf']"):
-        txt = (a.get_text() or "").strip().lower()
-        if any(w in txt for w in PDF_WORDS):
-            pdf_links.append((a.get("href"), a.get_text(strip=True)))
-
-    return product_links, specs, pdf_links
+    page = parse_page(html)
+    return page.product_links, page.specs, page.pdf_links
 
 
 def guess_model(text: str) -> str:
     m = MODEL_PAT.search(text or "")
     return m.group(1) if m else ""
-
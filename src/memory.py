@@ -0,0 +1,81 @@
+import os
+import sys
+from typing import Dict, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+MB = 1024 * 1024
+
+
+def python_peak_rss() -> Optional[int]:
+    """Peak resident memory of this process in bytes."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _proc_table() -> Optional[Dict[int, Tuple[int, str, int]]]:
+    """pid -> (ppid, executable, rss bytes) for every process, from psutil or /proc."""
+    table = {}
+    if psutil is not None:
+        for p in psutil.process_iter():
+            try:
+                table[p.pid] = (p.ppid(), p.exe(), p.memory_info().rss)
+            except psutil.Error:
+                pass
+        return table
+    if not os.path.isdir("/proc"):
+        return None
+    page = os.sysconf("SC_PAGE_SIZE")
+    for pid in os.listdir("/proc"):
+        if not pid.isdigit():
+            continue
+        try:
+            with open(f"/proc/{pid}/stat", "rb") as f:
+                stat = f.read()
+            with open(f"/proc/{pid}/statm") as f:
+                rss = int(f.read().split()[1]) * page
+            try:
+                exe = os.readlink(f"/proc/{pid}/exe")
+            except OSError:
+                exe = ""
+        except OSError:
+            continue  # exited meanwhile
+        # the command name may contain spaces; the ppid follows the closing parenthesis
+        table[int(pid)] = (int(stat[stat.rindex(b")") + 2:].split()[1]), exe, rss)
+    return table
+
+
+def browser_rss() -> Optional[int]:
+    """Current resident memory of the Playwright driver and Chromium in bytes.
+
+    Sums every descendant of this process except Python ones (the PDF extraction
+    pool) and their children. None where neither psutil nor /proc is available.
+    """
+    table = _proc_table()
+    if table is None:
+        return None
+    python = os.path.realpath(sys.executable)
+    children = {}
+    for pid, (ppid, exe, _) in table.items():
+        children.setdefault(ppid, []).append(pid)
+    total = 0
+    stack = list(children.get(os.getpid(), []))
+    while stack:
+        pid = stack.pop()
+        ppid, exe, rss = table[pid]
+        if exe and os.path.realpath(exe) == python:
+            continue
+        total += rss
+        stack.extend(children.get(pid, []))
+    return total
@@ -0,0 +1,183 @@
+import bisect
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Tuple
+
+# Upper bounds (seconds) of the stage histogram buckets
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+           1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+PREFIX = "hvac_scraper"
+
+# Stages in the order a page goes through them (others are listed after these)
+STAGES = ["robots", "robots_fetch", "rate_limit_wait", "http_fetch", "navigate", "parse", "fingerprint",
+          "pdf_download", "pdf_parse", "normalize", "write"]
+
+
+class Histogram:
+    """Fixed-bucket latency histogram: count, sum and max plus per-bucket counts."""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (capped at the max seen)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(BUCKETS, self.counts):
+            seen += n
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+
+class Metrics:
+    """Process-wide stage timers and counters.
+
+    `timer(stage)`/`observe(stage, seconds)` feed one histogram per stage;
+    `inc(name, value, **labels)` adds to a labelled counter and `error(stage, exc)`
+    counts failures by exception type. One lock acquisition per event keeps the
+    overhead at a few microseconds, so it stays on in production.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stages: Dict[str, Histogram] = {}
+        self.counters: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = {}
+        self._textfile = None
+        self._stop = threading.Event()
+
+    def observe(self, stage: str, seconds: float):
+        with self._lock:
+            h = self.stages.get(stage)
+            if h is None:
+                h = self.stages[stage] = Histogram()
+            h.observe(seconds)
+
+    @contextmanager
+    def timer(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def inc(self, name: str, value: float = 1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def error(self, stage: str, exc: BaseException):
+        self.inc("errors", stage=stage, type=type(exc).__name__)
+
+    def value(self, name: str, **labels) -> float:
+        with self._lock:
+            return self.counters.get((name, tuple(sorted(labels.items()))), 0)
+
+    def _ordered_stages(self):
+        return sorted(self.stages.items(), key=lambda kv: (STAGES.index(kv[0]) if kv[0] in STAGES else len(STAGES),
+                                                            kv[0]))
+
+    def snapshot(self) -> dict:
+        """Compact view for the progress JSON stream."""
+        with self._lock:
+            stages = {
+                name: {"n": h.count, "seconds": round(h.total, 3), "p50": round(h.quantile(0.5), 4),
+                       "p95": round(h.quantile(0.95), 4)}
+                for name, h in self._ordered_stages()
+            }
+            counters = list(self.counters.items())
+        errors = {}
+        bytes_fetched = {}
+        for (name, labels), value in counters:
+            lbl = dict(labels)
+            if name == "errors":
+                key = f"{lbl['stage']}:{lbl['type']}"
+                errors[key] = errors.get(key, 0) + int(value)
+            elif name == "bytes_fetched":
+                bytes_fetched[lbl["source"]] = int(value)
+        return {"stages": stages, "bytesFetched": bytes_fetched, "errors": errors}
+
+    def summary(self) -> str:
+        rows = [("Stage", "Count", "Total s", "Mean ms", "p50 ms", "p95 ms", "Max ms")]
+        with self._lock:
+            for name, h in self._ordered_stages():
+                rows.append((name, str(h.count), f"{h.total:.1f}", f"{h.total / max(1, h.count) * 1000:.1f}",
+                             f"{h.quantile(0.5) * 1000:.1f}", f"{h.quantile(0.95) * 1000:.1f}",
+                             f"{h.max * 1000:.1f}"))
+            counters = sorted(self.counters.items())
+        widths = [max(len(r[i]) for r in rows) for i in range(len(rows[0]))]
+        lines = ["  ".join(v.ljust(w) if i == 0 else v.rjust(w) for i, (v, w) in enumerate(zip(r, widths)))
+                 for r in rows]
+        for (name, labels), value in counters:
+            lbl = ", ".join(f"{k}={v}" for k, v in labels)
+            lines.append(f"{name}{f' ({lbl})' if lbl else ''}: {value:g}")
+        return "\n".join(lines)
+
+    def prometheus(self) -> str:
+        """Text exposition format (for node_exporter's textfile collector)."""
+        out = [f"# TYPE {PREFIX}_stage_seconds histogram"]
+        with self._lock:
+            for name, h in self._ordered_stages():
+                seen = 0
+                for bound, n in zip(BUCKETS, h.counts):
+                    seen += n
+                    out.append(f'{PREFIX}_stage_seconds_bucket{{stage="{name}",le="{bound:g}"}} {seen}')
+                out.append(f'{PREFIX}_stage_seconds_bucket{{stage="{name}",le="+Inf"}} {h.count}')
+                out.append(f'{PREFIX}_stage_seconds_sum{{stage="{name}"}} {h.total:.6f}')
+                out.append(f'{PREFIX}_stage_seconds_count{{stage="{name}"}} {h.count}')
+            counters = sorted(self.counters.items())
+        typed = set()
+        for (name, labels), value in counters:
+            metric = f"{PREFIX}_{name}_total"
+            if metric not in typed:
+                typed.add(metric)
+                out.append(f"# TYPE {metric} counter")
+            lbl = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+            out.append(f"{metric}{{{lbl}}} {value:g}" if lbl else f"{metric} {value:g}")
+        return "\n".join(out) + "\n"
+
+    def write_textfile(self, path: str):
+        # write-then-rename so the collector never reads a half-written file
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.prometheus())
+        os.replace(tmp, path)
+
+    def export_to(self, path: str, interval: float = 15.0):
+        """Rewrite the Prometheus textfile at `path` every `interval` seconds until `close()`."""
+        self._textfile = path
+        self._stop.clear()
+
+        def loop():
+            while not self._stop.wait(interval):
+                self.write_textfile(path)
+
+        threading.Thread(target=loop, daemon=True).start()
+
+    def close(self):
+        self._stop.set()
+        if self._textfile:
+            self.write_textfile(self._textfile)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+METRICS = Metrics()
@@ -1,11 +1,30 @@
 import json
 import re
+import threading
 from typing import Dict, Any
+from functools import lru_cache
 from pathlib import Path
-from pint import UnitRegistry
 
-ureg = UnitRegistry()
-Q_ = ureg.Quantity
+_registry = None
+# guards the one-time builds below, so threads normalizing at once share one registry and one index;
+# reentrant because building the indexes primes conversions through the registry
+_init_lock = threading.RLock()
+
+
+def unit_registry():
+    # built on first use: importing pint and constructing the registry costs ~0.5 s of startup
+    global _registry
+    if _registry is None:
+        with _init_lock:
+            if _registry is None:
+                from pint import UnitRegistry
+                _registry = UnitRegistry()
+    return _registry
+
+
+def Q_(value, unit):
+    return unit_registry().Quantity(value, unit)
+
 
 # Load the spec catalog once
 _catalog_cache = None
@@ -19,7 +38,23 @@ def load_catalog(path: str = "specs/spec_catalog.json") -> Dict[str, Any]:
 _num_re = re.compile(r"([-+]?[0-9]*\.?[0-9]+)")
 _unit_re = re.compile(r"([A-Za-z\/()°\-]+)")
 
-_alias_map_cache: Dict[str, Dict[str, str]] = {}
+_alias_map_cache: Dict[str, Any] = {}
+
+# Unit spellings seen on spec sheets; their factors to each catalog canonical unit are
+# computed once at catalog load, anything else is resolved (and memoized) on first use
+COMMON_UNITS = [
+    "ton", "tons", "kW", "W", "Btu/h", "BTU/h", "btu/h", "MBH",
+    "A", "amp", "amps", "mA",
+    "in", "inch", "inches", "ft", "feet", "mm", "cm", "m",
+    "lb", "lbs", "pound", "kg", "g",
+    "CFM", "cfm", "ft^3/min", "m^3/h", "L/s",
+    "inH2O", "Pa", "kPa", "psi",
+    "dB", "dB(A)", "dBA",
+]
+
+# Marker for conversions that are not a plain factor (offset or logarithmic units)
+_PINT = object()
+
 
 def _build_alias_map(cat: Dict[str, Any]) -> Dict[str, Dict[str, str]]:
     amap = {}
@@ -33,72 +68,111 @@ def _build_alias_map(cat: Dict[str, Any]) -> Dict[str, Dict[str, str]]:
     return amap
 
 
-def _parse_number_with_unit(val: str):
-    s = (val or "").strip()
-    # Try a simple "number unit" parse
+def _build_global_alias_index(amap: Dict[str, Dict[str, str]]) -> Dict[str, str]:
+    # the first product type (catalog order) defining an alias wins, as the old per-type scan did
+    index = {}
+    for amapP in amap.values():
+        for alias, canon in amapP.items():
+            index.setdefault(alias, canon)
+    return index
+
+
+@lru_cache(maxsize=4096)
+def _unit_conversion(unit: str, canonical_unit: str):
+    """How a number written in `unit` maps to `canonical_unit`.
+
+    Returns a multiplication factor, None when the value is kept as written
+    (unknown unit or incompatible dimensions) or _PINT when only a full pint
+    conversion is exact (offset/logarithmic units).
+    """
     try:
-        # allow like "20 ton", "70 kW", "460V", "208/230V"
-        # normalize some common units first
-        s = s.replace("°", " ")
-        # If it looks like volts (e.g., 460V), separate
-        s = s.replace("V", " V").replace("v", " V")
-        parts = s.split()
-        if len(parts) >= 2 and _num_re.search(parts[0]):
-            q = Q_(float(_num_re.search(parts[0]).group(1)), parts[1])
-            return q
+        q = Q_(1.0, unit)
     except Exception:
-        pass
-    # Fallback: extract first number only
+        return None
+    try:
+        if not (q._is_multiplicative and Q_(1.0, canonical_unit)._is_multiplicative):
+            return _PINT
+        return q.to(canonical_unit).magnitude
+    except Exception:
+        return None
+
+
+def _prime_conversions(cat: Dict[str, Any]):
+    canonical_units = {meta["canonical_unit"] for conf in cat.values()
+                       for meta in conf.get("fields", {}).values() if meta.get("canonical_unit")}
+    for canon in canonical_units:
+        for unit in COMMON_UNITS + [canon]:
+            _unit_conversion(unit, canon)
+
+
+def _get_indexes(cat: Dict[str, Any]):
+    amap = _alias_map_cache.get("map")
+    if amap is None:
+        with _init_lock:
+            amap = _alias_map_cache.get("map")
+            if amap is None:
+                amap = _build_alias_map(cat)
+                _alias_map_cache["global"] = _build_global_alias_index(amap)
+                _prime_conversions(cat)
+                _alias_map_cache["map"] = amap
+    return amap, _alias_map_cache["global"]
+
+
+def _normalize_number(v: str, canonical_unit: str = None):
+    """Numeric value of `v` in `canonical_unit` (None if `v` holds no number).
+
+    Same rules as the original pint-per-value parse: the first number is the
+    value, and when the first token is numeric the second token is its unit.
+    Conversions go through the memoized factor table; pint only runs for
+    non-multiplicative units.
+    """
+    # normalize some common units first (e.g., "460V" -> "460 V")
+    s = v.replace("°", " ").replace("V", " V").replace("v", " V")
     m = _num_re.search(s)
-    if m:
+    if m is None:
+        return None
+    x = float(m.group(1))
+    if not canonical_unit:
+        return x
+    parts = s.split()
+    if len(parts) < 2 or not _num_re.search(parts[0]):
+        return x
+    conv = _unit_conversion(parts[1], canonical_unit)
+    if conv is None:
+        return x
+    if conv is _PINT:
         try:
-            return float(m.group(1))
+            return Q_(x, parts[1]).to(canonical_unit).magnitude
         except Exception:
-            return None
-    return None
+            return x
+    return x * conv
 
 
 def normalize_specs(raw: Dict[str, str], product_type: str, catalog_path: str = "specs/spec_catalog.json") -> Dict[str, Any]:
     cat = load_catalog(catalog_path)
-    amap = _alias_map_cache.get("map")
-    if amap is None:
-        amap = _build_alias_map(cat)
-        _alias_map_cache["map"] = amap
+    amap, global_aliases = _get_indexes(cat)
 
     conf = cat.get(product_type) or {}
     fields = conf.get("fields", {})
 
     out: Dict[str, Any] = {k: None for k in fields.keys()}
 
+    type_aliases = amap.get(product_type, {})
+
     # 1) Map aliases → canonical keys
     for k_raw, v_raw in (raw or {}).items():
         k_l = (k_raw or "").strip().lower()
         # try match inside this product_type first, otherwise global by best effort
-        canon = amap.get(product_type, {}).get(k_l)
-        if not canon:
-            # try any product type alias map
-            for p, amapP in amap.items():
-                if k_l in amapP:
-                    canon = amapP[k_l]
-                    break
+        canon = type_aliases.get(k_l) or global_aliases.get(k_l)
         if not canon:
             continue
         meta = fields.get(canon, {})
         v = (v_raw or "").strip()
         vtype = meta.get("value_type", "string")
         if vtype == "number":
-            canonical_unit = meta.get("canonical_unit")
-            parsed = _parse_number_with_unit(v)
-            if parsed is None:
+            v_norm = _normalize_number(v, meta.get("canonical_unit"))
+            if v_norm is None:
                 continue
-            if canonical_unit and hasattr(parsed, "to"):
-                try:
-                    v_norm = parsed.to(canonical_unit).magnitude
-                except Exception:
-                    # if incompatible units (e.g., unitless) just take float
-                    v_norm = float(parsed.magnitude if hasattr(parsed, "magnitude") else parsed)
-            else:
-                v_norm = float(parsed.magnitude if hasattr(parsed, "magnitude") else parsed)
             out[canon] = v_norm
         elif vtype == "enum":
             allowed = [str(x).lower() for x in meta.get("allowed", [])]
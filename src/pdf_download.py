@@ -0,0 +1,157 @@
+import threading
+import time
+from concurrent.futures import Executor, Future
+from typing import Callable, Dict, List, Optional
+
+from .metrics import METRICS
+from .pdf_store import PdfStore
+
+# Content types that are never a PDF (HTML error and login pages, images); anything else is checked by its bytes
+NOT_PDF_TYPES = ("text/", "image/", "video/", "audio/", "application/json", "application/xhtml")
+# The %PDF- header may follow a little junk, but must appear within the first KB
+MAGIC_WINDOW = 1024
+
+
+class SkippedDownload(Exception):
+    """The response was not fetched into the store: `reason` is "not_pdf" or "too_large"."""
+
+    def __init__(self, url: str, reason: str):
+        super().__init__(f"{reason}: {url}")
+        self.reason = reason
+
+
+class PdfDownloader:
+    """Downloads one crawl's PDFs into the store, several at a time and each URL once.
+
+    `fetch_all(urls)` starts every URL of a page on the shared `pool` and waits
+    for all of them; `get` (the crawl's pooled, per-host rate-limited
+    `http_get`) spaces the requests, so a page's documents overlap their
+    transfers instead of queueing behind each other. Responses are checked
+    before the body is stored: HTML/image content types, a Content-Length over
+    `max_bytes` and bodies without a %PDF header are dropped, and a body
+    without Content-Length is cut off at `max_bytes`. URLs are remembered for
+    the run, so a submittal linked from 50 product pages is requested once.
+    """
+
+    def __init__(self, store: PdfStore, get: Callable[..., object], pool: Executor, max_bytes: int = 0):
+        self.store = store
+        self.get = get
+        self.pool = pool
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._urls: Dict[str, Future] = {}
+        # documents were requested (downloaded or revalidated), cached ones served by the store without a request
+        self.stats = {"documents": 0, "cached": 0, "bytes": 0, "reused": 0, "not_pdf": 0, "too_large": 0,
+                      "failed": 0}
+        # wall time with at least one download running, for bytes/s and documents/s
+        self._active = 0
+        self._since = 0.0
+        self.busy = 0.0
+
+    def _count(self, key: str, n: int = 1):
+        with self._lock:
+            self.stats[key] += n
+        if key != "bytes":
+            METRICS.inc("pdf_downloads", n, event=key)
+
+    def _checked_get(self, url: str, headers: dict = None):
+        resp = self.get(url, headers=headers)
+        if resp.status_code != 200:
+            return resp
+        ctype = resp.headers.get("Content-Type", "").split(";")[0].strip().lower()
+        length = resp.headers.get("Content-Length")
+        reason = None
+        if ctype.startswith(NOT_PDF_TYPES):
+            reason = "not_pdf"
+        elif self.max_bytes and length and length.isdigit() and int(length) > self.max_bytes:
+            reason = "too_large"
+        if reason:
+            resp.close()
+            raise SkippedDownload(url, reason)
+        body = resp.iter_content(1 << 16)
+        resp.iter_content = lambda *a, **k: self._checked_body(url, body)
+        return resp
+
+    def _checked_body(self, url: str, chunks):
+        head = b""
+        size = 0
+        for chunk in chunks:
+            size += len(chunk)
+            if self.max_bytes and size > self.max_bytes:
+                raise SkippedDownload(url, "too_large")
+            if head is None:
+                yield chunk
+                continue
+            # hold the first chunks back until the %PDF- header shows up
+            head += chunk
+            if b"%PDF-" in head[:MAGIC_WINDOW]:
+                yield head
+                head = None
+            elif len(head) >= MAGIC_WINDOW:
+                raise SkippedDownload(url, "not_pdf")
+        if head is not None:
+            raise SkippedDownload(url, "not_pdf")
+        self._count("bytes", size)
+
+    def _download(self, url: str) -> Optional[str]:
+        with self._lock:
+            if self._active == 0:
+                self._since = time.monotonic()
+            self._active += 1
+        requested = False
+
+        def get(url: str, headers: dict = None):
+            nonlocal requested
+            requested = True
+            return self._checked_get(url, headers)
+
+        try:
+            with METRICS.timer("pdf_download"):
+                sha = self.store.fetch(url, get)
+            self._count("documents" if requested else "cached")
+            return sha
+        except SkippedDownload as e:
+            self._count(e.reason)
+        except Exception as e:
+            METRICS.error("pdf_download", e)
+            self._count("failed")
+        finally:
+            with self._lock:
+                self._active -= 1
+                if self._active == 0:
+                    self.busy += time.monotonic() - self._since
+        return None
+
+    def fetch_all(self, urls: List[str]) -> List[Optional[str]]:
+        """sha256 in the store of each URL, or None when it was skipped or failed."""
+        futures = []
+        for url in urls:
+            with self._lock:
+                fut = self._urls.get(url)
+                if fut is None:
+                    fut = self._urls[url] = self.pool.submit(self._download, url)
+                    reused = False
+                else:
+                    reused = True
+            if reused:
+                self._count("reused")
+            futures.append(fut)
+        return [f.result() for f in futures]
+
+    def snapshot(self) -> dict:
+        """Figures for the progress JSON stream."""
+        with self._lock:
+            s = dict(self.stats)
+            busy = self.busy + (time.monotonic() - self._since if self._active else 0.0)
+        secs = max(busy, 1e-9)
+        return {"documents": s["documents"], "bytes": s["bytes"], "docsPerSec": round(s["documents"] / secs, 2),
+                "bytesPerSec": int(s["bytes"] / secs), "cached": s["cached"], "reused": s["reused"],
+                "skipped": s["not_pdf"] + s["too_large"], "failed": s["failed"]}
+
+    def summary(self) -> str:
+        s = self.stats
+        secs = max(self.busy, 1e-9)
+        return (f"PDF downloads: {s['documents']} documents, {s['bytes'] / 1048576:.1f} MB in {self.busy:.1f}s "
+                f"({s['documents'] / secs:.1f} docs/s, {s['bytes'] / 1048576 / secs:.2f} MB/s); "
+                f"{s['cached']} served from the store, {s['reused']} repeat links reused, {s['not_pdf']} not PDFs, {s['too_large']} too large, "
+                f"{s['failed']} failed")
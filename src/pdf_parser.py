@@ -1,10 +1,34 @@
 import io
-import pdfplumber
-from typing import Dict
+import json
+import re
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Tuple
+
+# Bump when extraction output changes so cached results in the PDF store are not reused
+EXTRACTOR_VERSION = 1
+
+# Aliases shorter than this ("l", "w", "kw") match almost any page, so they don't mark candidates
+MIN_KEYWORD_LEN = 3
+
+
+def _kv_from_tables(tables, data: Dict[str, str]):
+    for tbl in tables or []:
+        for row in tbl:
+            if not row:
+                continue
+            cells = [ (c or "").strip() for c in row ]
+            if len(cells) >= 2 and len(cells[0]) > 0 and len(cells[1]) > 0:
+                k = cells[0]
+                v = cells[1]
+                if k and v and k not in data:
+                    data[k] = v
 
 # Very basic: tries to read 2-column key/value tables
 
 def extract_kv_from_pdf(pdf_bytes: bytes) -> Dict[str, str]:
+    import pdfplumber  # only the extraction workers need it
     data = {}
     with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
         for page in pdf.pages:
@@ -12,15 +36,69 @@ def extract_kv_from_pdf(pdf_bytes: bytes) -> Dict[str, str]:
                 tables = page.extract_tables()
             except Exception:
                 tables = []
-            for tbl in tables or []:
-                for row in tbl:
-                    if not row:
-                        continue
-                    cells = [ (c or "").strip() for c in row ]
-                    if len(cells) >= 2 and len(cells[0]) > 0 and len(cells[1]) > 0:
-                        k = cells[0]
-                        v = cells[1]
-                        if k and v and k not in data:
-                            data[k] = v
+            _kv_from_tables(tables, data)
     return data
 
+
+@lru_cache(maxsize=32)
+def _catalog_terms(product_type: str, catalog_path: str):
+    """(keyword regex, alias -> canonical field map, canonical fields) for a product type.
+
+    Unknown product types get the aliases of every type in the catalog and no
+    field set, so they are never considered fully covered.
+    """
+    cat = json.loads(Path(catalog_path).read_text(encoding="utf-8"))
+    confs = [cat[product_type]] if product_type in cat else list(cat.values())
+    amap = {}
+    for conf in confs:
+        for canon, meta in conf.get("fields", {}).items():
+            for a in [canon] + list(meta.get("aliases", [])):
+                amap[a.strip().lower()] = canon
+    words = sorted((a for a in amap if len(a) >= MIN_KEYWORD_LEN), key=len, reverse=True)
+    pattern = re.compile(r"(?<![a-z0-9])(?:" + "|".join(re.escape(w) for w in words) + r")(?![a-z0-9])")
+    fields = frozenset(cat[product_type]["fields"]) if product_type in cat else frozenset()
+    return pattern, amap, fields
+
+
+def scan_kv_from_pdf(pdf_bytes: bytes, product_type: str = None, max_pages: int = 0, time_budget: float = 0,
+                     catalog_path: str = "specs/spec_catalog.json") -> Tuple[Dict[str, str], Dict[str, int]]:
+    """Lazy variant of `extract_kv_from_pdf`.
+
+    Reads each page's text layer first and runs table extraction only on pages
+    mentioning a catalog alias. Stops once every catalog field of `product_type`
+    is covered, or when `max_pages` pages / `time_budget` seconds are used up
+    (0 disables a budget). Returns (kv, stats) where stats counts the document's
+    pages, the pages whose tables were extracted and the pages skipped.
+    """
+    import pdfplumber
+    pattern, amap, fields = _catalog_terms(product_type or "", catalog_path)
+    data = {}
+    covered = set()
+    stats = {"pages": 0, "table_pages": 0, "skipped_pages": 0, "budget_stops": 0}
+    started = time.monotonic()
+    with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
+        stats["pages"] = len(pdf.pages)
+        for i, page in enumerate(pdf.pages):
+            if (max_pages and i >= max_pages) or (time_budget and time.monotonic() - started > time_budget):
+                stats["budget_stops"] = 1
+                break
+            if fields and covered >= fields:
+                break
+            try:
+                text = (page.extract_text() or "").lower()
+            except Exception:
+                text = ""
+            if not pattern.search(text):
+                continue
+            try:
+                tables = page.extract_tables()
+            except Exception:
+                tables = []
+            stats["table_pages"] += 1
+            _kv_from_tables(tables, data)
+            for k in data:
+                canon = amap.get(k.strip().lower())
+                if canon:
+                    covered.add(canon)
+    stats["skipped_pages"] = stats["pages"] - stats["table_pages"]
+    return data, stats
@@ -0,0 +1,83 @@
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, Optional, Tuple
+
+from .metrics import METRICS
+from .pdf_parser import EXTRACTOR_VERSION, extract_kv_from_pdf, scan_kv_from_pdf
+
+
+def _extract_file(path: str, product_type: str, mode: str, max_pages: int,
+                  time_budget: float) -> Tuple[Dict[str, str], Optional[Dict[str, int]], float]:
+    # runs in a worker process; the PDF is read there so only the path is pickled
+    start = time.perf_counter()
+    with open(path, "rb") as f:
+        data = f.read()
+    if mode == "lazy":
+        kv, scan = scan_kv_from_pdf(data, product_type, max_pages, time_budget)
+    else:
+        kv, scan = extract_kv_from_pdf(data), None
+    return kv, scan, time.perf_counter() - start
+
+
+def _warm_up() -> int:
+    import pdfplumber  # noqa: F401  (the import is the slow part of a worker's first document)
+    return os.getpid()
+
+
+class PdfExtractionStage:
+    """Runs `extract_kv_from_pdf` in a process pool, off the crawl loop.
+
+    At most `max_pending` documents are queued or being parsed; `submit()`
+    blocks the caller once that many are outstanding, which keeps memory
+    bounded when the crawl finds PDFs faster than the cores can parse them.
+    """
+
+    def __init__(self, workers: int, max_pending: int, mode: str = "full", max_pages: int = 0,
+                 time_budget: float = 0):
+        # spawn: the crawler is multi-threaded, forking it is not safe
+        self._pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        self.workers = workers
+        self._slots = threading.BoundedSemaphore(max(1, max_pending))
+        self.mode = mode
+        self.max_pages = max_pages
+        self.time_budget = time_budget
+
+    def variant(self, product_type: str) -> str:
+        """Cache key for results of this stage's settings in the PDF store."""
+        if self.mode == "lazy":
+            # lazy scans stop early per product type, so their results are not interchangeable
+            return f"{EXTRACTOR_VERSION}:lazy:{product_type}"
+        return str(EXTRACTOR_VERSION)
+
+    def submit(self, path: str, product_type: str = None) -> Future:
+        """Queue a PDF; the future resolves to (kv, scan stats or None, seconds spent parsing)."""
+        self._slots.acquire()
+        try:
+            fut = self._pool.submit(_extract_file, path, product_type, self.mode, self.max_pages, self.time_budget)
+        except Exception:
+            self._slots.release()
+            raise
+        fut.add_done_callback(self._done)
+        return fut
+
+    def _done(self, fut: Future):
+        self._slots.release()
+        if fut.cancelled():
+            return
+        exc = fut.exception()
+        if exc is not None:
+            METRICS.error("pdf_parse", exc)
+        else:
+            # parse time measured in the worker, so queueing for a free process is not included
+            METRICS.observe("pdf_parse", fut.result()[2])
+
+    def warm(self):
+        """Start every worker process and load the PDF libraries in it (used by the warm worker)."""
+        for fut in [self._pool.submit(_warm_up) for _ in range(self.workers)]:
+            fut.result()
+
+    def shutdown(self):
+        self._pool.shutdown(wait=True)
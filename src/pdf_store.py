@@ -0,0 +1,212 @@
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional
+
+from .metrics import METRICS
+from .utils import ensure_dir
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    sha256 TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS urls (
+    url TEXT PRIMARY KEY,
+    sha256 TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    checked_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS kv (
+    sha256 TEXT NOT NULL,
+    version TEXT NOT NULL,
+    kv_json TEXT NOT NULL,
+    PRIMARY KEY (sha256, version)
+);
+"""
+
+
+class PdfStore:
+    """Content-addressed PDF store shared by every job that points at the same directory.
+
+    Blobs live under `root/blobs/<sha[:2]>/<sha>.pdf` and a SQLite index keeps
+    the URL -> sha256 mapping (with ETag/Last-Modified for revalidation), the
+    cached extraction result per blob and extractor variant, and LRU bookkeeping. Once the
+    blobs exceed `max_bytes` the least recently used ones are evicted.
+    """
+
+    def __init__(self, root: str, max_bytes: int, ttl: float = 7 * 86400):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        ensure_dir(os.path.join(root, "blobs"))
+        self._db = sqlite3.connect(os.path.join(root, "index.sqlite"), timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self.stats = {"fetch_hits": 0, "fetch_misses": 0, "revalidated": 0, "kv_hits": 0, "kv_misses": 0, "evicted": 0}
+
+    def blob_path(self, sha: str) -> str:
+        return os.path.join(self.root, "blobs", sha[:2], f"{sha}.pdf")
+
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+        METRICS.inc("pdf_store", event=key)
+
+    def _touch(self, sha: str):
+        with self._lock:
+            self._db.execute("UPDATE blobs SET last_used = ? WHERE sha256 = ?", (time.time(), sha))
+            self._db.commit()
+
+    def fetch(self, url: str, get: Callable[..., object]) -> str:
+        """Return the sha256 of the PDF at `url`, downloading it only when needed.
+
+        `get(url, headers)` must return a `requests`-style response. URLs checked
+        within the TTL are served from the store without any request; older ones
+        are revalidated with If-None-Match / If-Modified-Since.
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT sha256, etag, last_modified, checked_at FROM urls WHERE url = ?", (url,)
+            ).fetchone()
+        headers = {}
+        if row and os.path.exists(self.blob_path(row[0])):
+            sha, etag, last_modified, checked_at = row
+            if time.time() - checked_at < self.ttl:
+                self._count("fetch_hits")
+                self._touch(sha)
+                return sha
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        resp = get(url, headers=headers)
+        try:
+            if resp.status_code == 304 and row:
+                self._count("revalidated")
+                self._index_url(url, row[0], row[1], row[2])
+                self._touch(row[0])
+                return row[0]
+
+            self._count("fetch_misses")
+            # streamed to disk while hashing, so a large PDF is never held in memory
+            sha = self.put_stream(resp.iter_content(1 << 16))
+            METRICS.inc("bytes_fetched", os.path.getsize(self.blob_path(sha)), source="pdf")
+            self._index_url(url, sha, resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+            return sha
+        finally:
+            resp.close()
+
+    def _index_url(self, url: str, sha: str, etag: Optional[str], last_modified: Optional[str]):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO urls (url, sha256, etag, last_modified, checked_at) VALUES (?, ?, ?, ?, ?)",
+                (url, sha, etag, last_modified, time.time()),
+            )
+            self._db.commit()
+
+    def put_stream(self, chunks: Iterable[bytes]) -> str:
+        """Store data arriving in chunks (e.g. `resp.iter_content()`) as a blob; returns its sha256."""
+        tmp = os.path.join(self.root, "blobs", f"incoming.{os.getpid()}.{threading.get_ident()}.tmp")
+        h = hashlib.sha256()
+        size = 0
+        try:
+            with open(tmp, "wb") as f:
+                for chunk in chunks:
+                    h.update(chunk)
+                    f.write(chunk)
+                    size += len(chunk)
+            sha = h.hexdigest()
+            path = self.blob_path(sha)
+            if os.path.exists(path):
+                os.remove(tmp)
+            else:
+                ensure_dir(os.path.dirname(path))
+                os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+        self._add_blob(sha, size)
+        return sha
+
+    def _add_blob(self, sha: str, size: int):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO blobs (sha256, size, last_used) VALUES (?, ?, ?)",
+                (sha, size, time.time()),
+            )
+            self._db.commit()
+        self._evict(keep=sha)
+
+    def link_into(self, sha: str, dest: str):
+        """Hardlink the blob to `dest` (copy when linking is not possible)."""
+        if os.path.exists(dest):
+            return
+        ensure_dir(os.path.dirname(dest))
+        try:
+            os.link(self.blob_path(sha), dest)
+        except OSError:
+            shutil.copyfile(self.blob_path(sha), dest)
+
+    def get_kv(self, sha: str, version: str) -> Optional[Dict[str, str]]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT kv_json FROM kv WHERE sha256 = ? AND version = ?", (sha, version)
+            ).fetchone()
+        if row is None:
+            self._count("kv_misses")
+            return None
+        self._count("kv_hits")
+        return json.loads(row[0])
+
+    def put_kv(self, sha: str, version: str, kv: Dict[str, str]):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO kv (sha256, version, kv_json) VALUES (?, ?, ?)",
+                (sha, version, json.dumps(kv, ensure_ascii=False)),
+            )
+            self._db.commit()
+
+    def _evict(self, keep: str = None):
+        with self._lock:
+            total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            victims = []
+            for sha, size in self._db.execute("SELECT sha256, size FROM blobs ORDER BY last_used"):
+                if total <= self.max_bytes:
+                    break
+                if sha == keep:
+                    continue
+                victims.append(sha)
+                total -= size
+            for sha in victims:
+                self._db.execute("DELETE FROM blobs WHERE sha256 = ?", (sha,))
+                self._db.execute("DELETE FROM urls WHERE sha256 = ?", (sha,))
+                self._db.execute("DELETE FROM kv WHERE sha256 = ?", (sha,))
+                try:
+                    os.remove(self.blob_path(sha))
+                except OSError:
+                    pass
+            self._db.commit()
+            self.stats["evicted"] += len(victims)
+
+    def summary(self) -> str:
+        s = self.stats
+        return (f"PDF store: {s['fetch_hits']} cached, {s['revalidated']} revalidated, {s['fetch_misses']} downloaded; "
+                f"extraction cache {s['kv_hits']} hits / {s['kv_misses']} misses; {s['evicted']} evicted")
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,130 @@
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Optional
+from urllib.parse import urlparse
+
+
+class HostRateLimiter:
+    """Spaces out request starts per host by at least `delay` seconds.
+
+    `reserve()` books the next free slot for the URL's host and returns how long
+    the caller has to wait before sending the request, so the same limiter works
+    from asyncio workers (`await asyncio.sleep(...)`) and from plain threads.
+    """
+
+    def __init__(self, delay: float):
+        self.delay = max(0.0, delay)
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, url: str) -> float:
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, 0.0))
+            self._next_slot[host] = slot + self.delay
+        return slot - now
+
+
+def parse_retry_after(value: Optional[str]) -> float:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date), 0 if absent."""
+    if not value:
+        return 0.0
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return 0.0
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class AdaptiveRateLimiter(HostRateLimiter):
+    """Per-host token bucket whose rate follows robots.txt and the server's responses.
+
+    A host starts at one request per `delay` seconds (or its robots.txt
+    Crawl-delay / Request-rate, if slower). `feedback()` doubles the interval on
+    429/503 (up to `max_delay`) and holds the host for its Retry-After; every
+    `speedup_after` healthy responses in a row shrink the interval by 10%, down
+    to `min_delay` or the robots.txt rate, whichever is slower. Up to `burst`
+    requests may start back to back after the host was idle.
+    """
+
+    THROTTLE_STATUSES = (429, 503)
+
+    def __init__(self, delay: float, min_delay: float = None, max_delay: float = 60.0, burst: int = 1,
+                 robots_delay: Callable[[str], float] = None, speedup_after: int = 5):
+        super().__init__(delay)
+        self.min_delay = self.delay if min_delay is None else min(max(0.0, min_delay), self.delay)
+        self.max_delay = max(max_delay, self.delay)
+        self.burst = max(1, burst)
+        self.robots_delay = robots_delay
+        self.speedup_after = speedup_after
+        self._hosts = {}
+        self.throttled = 0
+
+    def _host(self, url: str) -> dict:
+        host = urlparse(url).netloc
+        state = self._hosts.get(host)
+        if state is None:
+            # robots.txt may need a request; do it outside the lock
+            robots = 0.0
+            if self.robots_delay is not None:
+                try:
+                    robots = self.robots_delay(url) or 0.0
+                except Exception:
+                    robots = 0.0
+            with self._lock:
+                state = self._hosts.setdefault(host, {
+                    "interval": max(self.delay, robots),
+                    "floor": max(self.min_delay, robots),
+                    "tat": 0.0,
+                    "healthy": 0,
+                })
+        return state
+
+    def reserve(self, url: str) -> float:
+        state = self._host(url)
+        with self._lock:
+            now = time.monotonic()
+            tau = (self.burst - 1) * state["interval"]
+            slot = max(now, state["tat"] - tau)
+            state["tat"] = max(state["tat"], now) + state["interval"]
+        return slot - now
+
+    def feedback(self, url: str, status: int, retry_after: Optional[str] = None):
+        """Adjust the host's rate after a response with HTTP `status`."""
+        state = self._host(url)
+        with self._lock:
+            if status in self.THROTTLE_STATUSES:
+                self.throttled += 1
+                state["healthy"] = 0
+                state["interval"] = min(self.max_delay, max(state["interval"] * 2, state["floor"], 1.0))
+                hold = parse_retry_after(retry_after)
+                if hold:
+                    now = time.monotonic()
+                    tau = (self.burst - 1) * state["interval"]
+                    state["tat"] = max(state["tat"], now + hold + tau)
+            elif status >= 500:
+                state["healthy"] = 0
+                state["interval"] = min(self.max_delay, max(state["interval"] * 1.5, state["floor"]))
+            else:
+                state["healthy"] += 1
+                if state["healthy"] >= self.speedup_after:
+                    state["healthy"] = 0
+                    state["interval"] = max(state["floor"], state["interval"] * 0.9)
+
+    def interval(self, url: str) -> float:
+        return self._host(url)["interval"]
+
+    def summary(self) -> str:
+        if not self._hosts:
+            return "Rate limiter: no requests"
+        slowest = max(self._hosts.items(), key=lambda kv: kv[1]["interval"])
+        return (f"Rate limiter: {self.throttled} throttled responses (429/503); slowest host {slowest[0]} "
+                f"at one request per {slowest[1]['interval']:.2f}s")
@@ -0,0 +1,220 @@
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from .classify import classify_many
+from .normalizer import _PINT, _get_indexes, _num_re, _unit_conversion, Q_, load_catalog
+from .save import NORMALIZED_HEADERS
+
+NUM_PATTERN = _num_re.pattern
+BOOL_TRUE = ("yes", "true", "1", "y")
+
+
+def _field_meta(cat: Dict) -> pd.DataFrame:
+    rows = []
+    for ptype, conf in cat.items():
+        for canon, meta in conf.get("fields", {}).items():
+            rows.append({
+                "product_type": ptype,
+                "canon": canon,
+                "value_type": meta.get("value_type", "string"),
+                "canonical_unit": meta.get("canonical_unit"),
+                "allowed": tuple(str(x).lower() for x in meta.get("allowed", [])),
+            })
+    return pd.DataFrame(rows, columns=["product_type", "canon", "value_type", "canonical_unit", "allowed"])
+
+
+def _explode_specs(specs_json: pd.Series, product_types: pd.Series) -> pd.DataFrame:
+    """One row per raw (key, value) pair, in the order they appear in each product."""
+    specs = [json.loads(s) if s else {} for s in specs_json]
+    counts = [len(d) for d in specs]
+    return pd.DataFrame({
+        "row": np.repeat(np.arange(len(specs)), counts),
+        "product_type": np.repeat(product_types.to_numpy(), counts),
+        # object dtype even when no product has specs, so the .str accessors still apply
+        "key": pd.Series([(k or "").strip().lower() for d in specs for k in d], dtype=object),
+        "value": pd.Series(["" if v is None else str(v).strip() for d in specs for v in d.values()], dtype=object),
+    })
+
+
+def _numbers(values: pd.Series, units: pd.Series) -> pd.Series:
+    """Vectorized `normalizer._normalize_number` over aligned value/canonical-unit columns."""
+    s = values.str.replace("°", " ", regex=False).str.replace("V", " V", regex=False).str.replace("v", " V", regex=False)
+    x = s.str.extract(NUM_PATTERN, expand=False).astype(float)
+    tokens = s.str.split()
+    unit = tokens.str[1]
+    # `_num_re` matches wherever there is a digit
+    convertible = units.notna() & unit.notna() & tokens.str[0].str.contains("[0-9]", na=False)
+
+    out = x.astype(object).where(x.notna(), None)
+    if not convertible.any():
+        return out
+    pairs = pd.DataFrame({"unit": unit[convertible], "canon": units[convertible]})
+    conv = {p: _unit_conversion(*p) for p in set(zip(pairs["unit"], pairs["canon"]))}
+    factors = pd.Series([conv[p] for p in zip(pairs["unit"], pairs["canon"])], index=pairs.index, dtype=object)
+
+    scaled = factors.map(lambda f: f is not None and f is not _PINT)
+    idx = scaled[scaled].index
+    out.loc[idx] = (x.loc[idx] * factors.loc[idx].astype(float)).to_numpy()
+    # offset/logarithmic units: exact pint conversion per value (cold path)
+    for i in scaled[~scaled].index:
+        if factors[i] is _PINT:
+            try:
+                out[i] = Q_(x[i], unit[i]).to(units[i]).magnitude
+            except Exception:
+                pass
+    return out
+
+
+def _enum_value(vv: str, allowed: tuple):
+    for a in allowed:
+        if vv == a or a in vv:
+            return a, True
+    return vv, False
+
+
+def normalize_frame(df: pd.DataFrame, product_types: pd.Series, cat: Dict) -> pd.DataFrame:
+    """Normalize a chunk of products.csv rows; same values as `normalize_specs` row by row."""
+    amap, global_aliases = _get_indexes(cat)
+    long = _explode_specs(df["specs_json"], product_types)
+
+    # alias -> canonical: the product type's own map first, then the global index
+    typed = pd.DataFrame(
+        [(p, a, c) for p, m in amap.items() for a, c in m.items()], columns=["product_type", "key", "canon"]
+    )
+    long = long.merge(typed, on=["product_type", "key"], how="left", sort=False)
+    long["canon"] = long["canon"].fillna(long["key"].map(global_aliases))
+    long = long[long["canon"].notna()].reset_index(drop=True)
+    long["pos"] = np.arange(len(long))
+
+    long = long.merge(_field_meta(cat), on=["product_type", "canon"], how="left", sort=False)
+    long["value_type"] = long["value_type"].fillna("string")
+    long["out"] = long["value"].astype(object)
+    long["priority"] = long["pos"].astype(float)
+
+    num = long["value_type"] == "number"
+    if num.any():
+        long.loc[num, "out"] = _numbers(long.loc[num, "value"], long.loc[num, "canonical_unit"])
+
+    is_bool = long["value_type"] == "bool"
+    long.loc[is_bool, "out"] = long.loc[is_bool, "value"].str.lower().isin(BOOL_TRUE)
+
+    enum = long["value_type"] == "enum"
+    if enum.any():
+        vv = long.loc[enum, "value"].str.lower().str.replace("r ", "r", regex=False).str.replace(" ", "-", regex=False)
+        pairs = list(zip(vv, long.loc[enum, "allowed"]))
+        resolved = {p: _enum_value(*p) for p in set(pairs)}
+        long.loc[enum, "out"] = [resolved[p][0] for p in pairs]
+        matched = np.array([resolved[p][1] for p in pairs], dtype=bool)
+        # a value in `allowed` overrides earlier ones; otherwise the first raw value is kept
+        pos = long.loc[enum, "pos"].to_numpy(dtype=float)
+        long.loc[enum, "priority"] = np.where(matched, len(long) + pos, -pos)
+
+    # numbers without a parsable value leave the field untouched; otherwise the last value wins
+    long = long[~(num & long["out"].isna())]
+    long = long.sort_values("priority", kind="stable").drop_duplicates(["row", "canon"], keep="last")
+    wide = long.pivot(index="row", columns="canon", values="out").reindex(range(len(df)))
+
+    out = pd.DataFrame(index=range(len(df)), columns=NORMALIZED_HEADERS, dtype=object)
+    out["manufacturer"] = df["manufacturer"].to_numpy()
+    out["product_type"] = product_types.to_numpy()
+    out["product_title"] = df["product_title"].to_numpy()
+    out["product_url"] = df["product_url"].to_numpy()
+    for col in NORMALIZED_HEADERS[5:]:
+        if col in wide.columns:
+            out[col] = wide[col].to_numpy()
+    model = wide["model"] if "model" in wide.columns else pd.Series(None, index=wide.index, dtype=object)
+    out["model"] = [(None if pd.isna(m) else m) or g or "" for m, g in zip(model, df["model_guess"])]
+    return out
+
+
+def _product_types(df: pd.DataFrame, default_product_type: Optional[str], known: Optional[Dict[str, str]]) -> pd.Series:
+    if default_product_type:
+        return pd.Series(default_product_type, index=df.index)
+    # products.csv has no page text, so the title and URL decide unless a previous run's type is known
+    types = pd.Series(classify_many(zip(df["product_title"], df["product_url"], [""] * len(df))), index=df.index)
+    if known:
+        types = df["product_url"].map(known).fillna(types)
+    return types
+
+
+def _process_chunk(args):
+    df, default_product_type, known, catalog_path = args
+    cat = load_catalog(catalog_path)
+    df = df.reset_index(drop=True)
+    return normalize_frame(df, _product_types(df, default_product_type, known), cat)
+
+
+def renormalize(input_path: str, output_path: str, chunksize: int = 50000, workers: int = None,
+                default_product_type: str = None, types_from: str = None,
+                catalog_path: str = "specs/spec_catalog.json", reclassify: bool = False) -> int:
+    """Rebuild a normalized CSV from a stored products.csv without touching the network.
+
+    Reads `input_path` in chunks, normalizes each chunk column-wise (in parallel
+    across `workers` processes) and replaces `output_path` once every chunk is
+    written. Returns the number of rows written.
+
+    Each URL keeps the product_type of `types_from`, by default the existing
+    `output_path`: the crawl classified it with page text and PDFs, which
+    products.csv does not store. URLs missing there, or all of them with
+    `reclassify`, are classified from title and URL.
+    """
+    known = None
+    if not reclassify and types_from is None and os.path.exists(output_path):
+        types_from = output_path
+    if types_from and not reclassify:
+        prev = pd.read_csv(types_from, usecols=["product_url", "product_type"], dtype=str, keep_default_na=False)
+        known = {u: t for u, t in zip(prev["product_url"], prev["product_type"]) if t}
+
+    workers = workers or os.cpu_count() or 1
+    reader = pd.read_csv(input_path, dtype=str, keep_default_na=False, chunksize=chunksize)
+    tmp = f"{output_path}.tmp"
+    rows = 0
+    with open(tmp, "w", newline="", encoding="utf-8") as f:
+        pd.DataFrame(columns=NORMALIZED_HEADERS).to_csv(f, index=False)
+
+        def write(frame):
+            nonlocal rows
+            frame.to_csv(f, header=False, index=False)
+            rows += len(frame)
+
+        tasks = ((chunk, default_product_type, known, catalog_path) for chunk in reader)
+        if workers <= 1:
+            for t in tasks:
+                write(_process_chunk(t))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                # keep at most two chunks per worker in flight, written in input order
+                pending = []
+                for t in tasks:
+                    pending.append(pool.submit(_process_chunk, t))
+                    if len(pending) >= workers * 2:
+                        write(pending.pop(0).result())
+                for fut in pending:
+                    write(fut.result())
+    os.replace(tmp, output_path)
+    return rows
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Re-normalize a stored products.csv with the current spec catalog")
+    ap.add_argument("--input", default="output/products.csv", help="products.csv to read")
+    ap.add_argument("--output", default="output/normalized_products.csv", help="Normalized CSV to (re)write")
+    ap.add_argument("--chunksize", type=int, default=50000, help="Rows per chunk")
+    ap.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    ap.add_argument("--default_product_type", help="Force a product_type label for normalization")
+    types = ap.add_mutually_exclusive_group()
+    types.add_argument("--types-from", help="Reuse product_type per URL from this normalized CSV (default: --output)")
+    types.add_argument("--reclassify", action="store_true",
+                       help="Classify every product again from its title and URL")
+    ap.add_argument("--catalog", default="specs/spec_catalog.json", help="Spec catalog path")
+    args = ap.parse_args()
+
+    n = renormalize(args.input, args.output, args.chunksize, args.workers, args.default_product_type,
+                    args.types_from, args.catalog, args.reclassify)
+    print(f"Wrote {n} rows to {args.output}")
@@ -1,22 +1,251 @@
+import json
+import os
+import re
+import threading
+import time
 import urllib.robotparser as urobot
-from urllib.parse import urljoin, urlparse
-from functools import lru_cache
-
-@lru_cache(maxsize=128)
-def get_robot_parser(base_url: str):
-    rp = urobot.RobotFileParser()
-    root = f"{urlparse(base_url).scheme}://{urlparse(base_url).netloc}"
-    rp.set_url(urljoin(root, "/robots.txt"))
-    try:
-        rp.read()
-    except Exception:
-        pass
-    return rp
-
-def allowed(user_agent: str, base_url: str, url: str) -> bool:
-    rp = get_robot_parser(base_url)
-    try:
-        return rp.can_fetch(user_agent, url)
-    except Exception:
-        return True  # if robots can't be read, default to allow (you can make this stricter)
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional
+from urllib.parse import quote, unquote, urlparse, urlunparse
 
+from .fetcher import get_session
+from .metrics import METRICS
+from .utils import ensure_dir, safe_filename
+
+# Bytes of robots.txt parsed (RFC 9309 asks for at least 500 KiB)
+MAX_BYTES = 512 * 1024
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+# Characters urllib.parse.quote leaves alone: paths made only of these need no normalizing
+_PLAIN = re.compile(r"[A-Za-z0-9_.~/-]*")
+
+
+def _root(url: str) -> str:
+    parts = urlparse(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _path(url: str, root: str) -> str:
+    """What RobotFileParser.can_fetch matches rules against."""
+    if url.startswith(root):
+        rest = url[len(root):]
+        if (not rest or rest[0] == "/") and _PLAIN.fullmatch(rest):
+            return rest or "/"
+    parsed = urlparse(unquote(url))
+    return quote(urlunparse(("", "", parsed.path, parsed.params, parsed.query, parsed.fragment))) or "/"
+
+
+class _Rules:
+    """A host's parsed robots.txt with `allowed` decisions memoized per rule prefix.
+
+    Rules match by path prefix and the first matching rule wins, so two paths
+    whose longest matching rule path is the same get the same answer: after
+    the first URL under a prefix, a check is a few dict lookups.
+    """
+
+    def __init__(self, rp: urobot.RobotFileParser):
+        self.rp = rp
+        # user agent -> (rule path lengths, longest to shortest; rule paths; prefix -> decision)
+        self._agents = {}
+        self._lock = threading.Lock()
+
+    def _agent(self, user_agent: str):
+        memo = self._agents.get(user_agent)
+        if memo is None:
+            entry = next((e for e in self.rp.entries if e.applies_to(user_agent)), self.rp.default_entry)
+            paths = {r.path for r in entry.rulelines} if entry else set()
+            memo = (sorted({len(p) for p in paths}, reverse=True), paths, {})
+            with self._lock:
+                memo = self._agents.setdefault(user_agent, memo)
+        return memo
+
+    def allowed(self, user_agent: str, url: str, root: str) -> bool:
+        if self.rp.disallow_all:
+            return False
+        if self.rp.allow_all:
+            return True
+        lengths, paths, decisions = self._agent(user_agent)
+        path = _path(url, root)
+        prefix = next((path[:n] for n in lengths if path[:n] in paths), "")
+        decision = decisions.get(prefix)
+        if decision is None:
+            try:
+                decision = self.rp.can_fetch(user_agent, url)
+            except Exception:
+                decision = True  # if robots can't be read, default to allow (you can make this stricter)
+            decisions[prefix] = decision
+        return decision
+
+
+class RobotsCache:
+    """robots.txt per host, kept in memory and in `root` for `ttl` seconds.
+
+    Files are fetched through the crawler's pooled session with a timeout and
+    revalidated with If-None-Match / If-Modified-Since once stale. A shorter
+    Cache-Control max-age wins over `ttl`. 401/403 disallow the whole host and
+    other 4xx allow it, as urllib's robotparser does. When robots.txt cannot be
+    fetched a stale copy is used if there is one, otherwise the host is
+    disallowed and retried after `error_ttl` seconds.
+    """
+
+    def __init__(self, root: Optional[str], user_agent: str, ttl: float = 86400, timeout: float = 10,
+                 error_ttl: float = 300):
+        self.root = root
+        self.user_agent = user_agent
+        self.ttl = ttl
+        self.timeout = timeout
+        self.error_ttl = error_ttl
+        if root:
+            ensure_dir(root)
+        # host root -> (_Rules, expires at)
+        self._hosts: Dict[str, tuple] = {}
+        self._roots: Dict[str, str] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.stats = {"disk_hits": 0, "fetches": 0, "revalidated": 0, "errors": 0}
+
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+        METRICS.inc("robots_cache", event=key)
+
+    def _file(self, root: str) -> str:
+        return os.path.join(self.root, safe_filename(root) + ".json")
+
+    def _load(self, root: str) -> Optional[dict]:
+        if not self.root:
+            return None
+        try:
+            with open(self._file(root), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save(self, root: str, entry: dict):
+        if not self.root:
+            return
+        path = self._file(root)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp, path)
+        except OSError:
+            pass  # the in-memory copy still serves this process
+
+    def _fresh_for(self, cache_control: str) -> float:
+        m = _MAX_AGE.search(cache_control or "")
+        # a few minutes at least, so max-age=0 does not mean a request per URL
+        return min(self.ttl, max(self.error_ttl, int(m.group(1)))) if m else self.ttl
+
+    def _fetch(self, root: str, cached: Optional[dict]) -> Optional[dict]:
+        headers = {}
+        if cached and cached["status"] == 200:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+        try:
+            with METRICS.timer("robots_fetch"):
+                r = get_session(self.user_agent).get(root + "/robots.txt", headers=headers, timeout=self.timeout,
+                                                     stream=True)
+                try:
+                    if r.status_code >= 500:
+                        raise OSError(f"HTTP {r.status_code}")
+                    body = r.raw.read(MAX_BYTES, decode_content=True) if r.status_code == 200 else b""
+                finally:
+                    r.close()
+        except Exception as e:
+            METRICS.error("robots_fetch", e)
+            self._count("errors")
+            return None
+        now = time.time()
+        expires = now + self._fresh_for(r.headers.get("Cache-Control"))
+        if r.status_code == 304 and cached:
+            self._count("revalidated")
+            return dict(cached, fetched_at=now, expires=expires)
+        self._count("fetches")
+        METRICS.inc("bytes_fetched", len(body), source="robots")
+        return {"status": r.status_code, "body": body.decode("utf-8", "replace"), "etag": r.headers.get("ETag"),
+                "last_modified": r.headers.get("Last-Modified"), "fetched_at": now, "expires": expires}
+
+    @staticmethod
+    def _parse(entry: Optional[dict]) -> urobot.RobotFileParser:
+        rp = urobot.RobotFileParser()
+        if entry is None:
+            rp.disallow_all = True
+        elif entry["status"] in (401, 403):
+            rp.disallow_all = True
+        elif entry["status"] != 200:
+            rp.allow_all = True
+        else:
+            rp.parse(entry["body"].splitlines())
+        rp.modified()
+        return rp
+
+    def _root(self, url: str) -> str:
+        root = self._roots.get(url)
+        if root is None:
+            root = self._roots[url] = _root(url)
+        return root
+
+    def rules(self, url: str) -> _Rules:
+        return self._host(_root(url))
+
+    def _host(self, root: str) -> _Rules:
+        hit = self._hosts.get(root)
+        if hit is not None and hit[1] > time.time():
+            return hit[0]
+        with self._lock:
+            lock = self._locks.setdefault(root, threading.Lock())
+        # one fetch per host; other threads asking for it wait for the result
+        with lock:
+            hit = self._hosts.get(root)
+            if hit is not None and hit[1] > time.time():
+                return hit[0]
+            cached = self._load(root)
+            if cached is not None and cached["expires"] > time.time():
+                self._count("disk_hits")
+                entry, expires = cached, cached["expires"]
+            else:
+                entry = self._fetch(root, cached)
+                if entry is not None:
+                    self._save(root, entry)
+                    expires = entry["expires"]
+                else:
+                    # unreachable: a stale copy beats disallowing the host
+                    entry = cached
+                    expires = time.time() + self.error_ttl
+            rules = _Rules(self._parse(entry))
+            self._hosts[root] = (rules, expires)
+            return rules
+
+    def allowed(self, base_url: str, url: str) -> bool:
+        """Whether `url` may be fetched under the robots.txt of `base_url`'s host."""
+        # base_url is one of a few seed URLs, so its host root is memoized too
+        root = self._root(base_url)
+        return self._host(root).allowed(self.user_agent, url, root)
+
+    def crawl_delay(self, url: str) -> float:
+        """Seconds between requests the host's robots.txt asks for (Crawl-delay or Request-rate), 0 if none."""
+        rp = self.rules(url).rp
+        try:
+            delay = float(rp.crawl_delay(self.user_agent) or 0)
+            rate = rp.request_rate(self.user_agent)
+        except Exception:
+            return 0.0
+        if rate and rate.requests:
+            delay = max(delay, rate.seconds / rate.requests)
+        return delay
+
+    def prefetch(self, urls: Iterable[str], workers: int = 16):
+        """Load the robots.txt of every host in `urls` in parallel."""
+        roots = sorted({_root(u) for u in urls})
+        if not roots:
+            return
+        with ThreadPoolExecutor(max_workers=min(workers, len(roots))) as pool:
+            list(pool.map(self.rules, roots))
+
+    def summary(self) -> str:
+        s = self.stats
+        return (f"robots.txt cache: {len(self._hosts)} hosts, {s['disk_hits']} read from disk, "
+                f"{s['fetches']} fetched, {s['revalidated']} revalidated, {s['errors']} unreachable")
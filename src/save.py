@@ -1,12 +1,13 @@
 import csv
+import io
+import json
 import os
-from typing import Dict
+import threading
+import time
+from typing import Dict, List, Sequence
+from .metrics import METRICS
 from .utils import ensure_dir
 
-PRODUCTS_CSV = "output/products.csv"
-DOCS_CSV = "output/documents.csv"
-NORMALIZED_CSV = "output/normalized_products.csv"
-
 PRODUCT_HEADERS = [
     "manufacturer", "product_title", "product_url", "model_guess",
     "specs_json"
@@ -26,28 +27,200 @@ NORMALIZED_HEADERS = [
     "ahri_id"
 ]
 
-def init_outputs():
-    ensure_dir("output")
-    ensure_dir("output/files")
-    if not os.path.exists(PRODUCTS_CSV):
-        with open(PRODUCTS_CSV, "w", newline="", encoding="utf-8") as f:
-            csv.writer(f).writerow(PRODUCT_HEADERS)
-    if not os.path.exists(DOCS_CSV):
-        with open(DOCS_CSV, "w", newline="", encoding="utf-8") as f:
-            csv.writer(f).writerow(DOC_HEADERS)
-    if not os.path.exists(NORMALIZED_CSV):
-        with open(NORMALIZED_CSV, "w", newline="", encoding="utf-8") as f:
-            csv.writer(f).writerow(NORMALIZED_HEADERS)
+# Columns written as float64 in Parquet; everything else is a string column
+NORMALIZED_NUMERIC = [
+    "capacity_ton", "eer", "ieer", "seer2", "mca_a", "mop_a",
+    "cfm", "esp_inwc", "length_in", "width_in", "height_in", "weight_lb",
+]
+
+ALIAS_HEADERS = [
+    # near-duplicate pages (regional paths, tab variants, print views) of a product saved under canonical_url
+    "manufacturer", "product_url", "canonical_url", "distance"
+]
+
+TABLES = {
+    "products": PRODUCT_HEADERS,
+    "documents": DOC_HEADERS,
+    "normalized_products": NORMALIZED_HEADERS,
+    "aliases": ALIAS_HEADERS,
+}
+
+def _repair_tail(path: str):
+    """Drop a partial last line left by a killed writer so appends start on a clean row."""
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return
+    with open(path, "rb+") as f:
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) == b"\n":
+            return
+        f.seek(0)
+        data = f.read()
+        f.truncate(data.rfind(b"\n") + 1)
+
+
+class _LineSink:
+    """Append-only CSV or JSONL file. Each batch is one os.write, so a killed
+    process leaves every previously flushed batch intact."""
+
+    def __init__(self, path: str, headers: List[str], fmt: str, fsync: bool = False):
+        self.headers = headers
+        self.fmt = fmt
+        self.fsync = fsync
+        _repair_tail(path)
+        new = not os.path.exists(path) or os.path.getsize(path) == 0
+        self.fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        if new and fmt == "csv":
+            self._write([], header=True)
+
+    def _write(self, rows: Sequence[Dict], header: bool = False):
+        buf = io.StringIO(newline="")
+        if self.fmt == "csv":
+            w = csv.DictWriter(buf, fieldnames=self.headers, extrasaction="ignore")
+            if header:
+                w.writeheader()
+            w.writerows(rows)
+        else:
+            for r in rows:
+                buf.write(json.dumps({h: r.get(h) for h in self.headers}, ensure_ascii=False, default=str))
+                buf.write("\n")
+        data = buf.getvalue().encode("utf-8")
+        while data:
+            n = os.write(self.fd, data)
+            data = data[n:]
+        if self.fsync:
+            os.fsync(self.fd)
+
+    def write(self, rows: Sequence[Dict]):
+        self._write(rows)
+
+    def close(self):
+        os.close(self.fd)
+
+
+class _ParquetSink:
+    """Directory of Parquet part files, one per flushed batch. Parts are written
+    to a temp name and renamed, so a kill never leaves a truncated part behind.
+    Needs pyarrow (or fastparquet) installed."""
+
+    def __init__(self, path: str, headers: List[str], fsync: bool = False):
+        import importlib.util
+        # fail when the run starts, not on the first flush
+        if not any(importlib.util.find_spec(m) for m in ("pyarrow", "fastparquet")):
+            raise ImportError("Parquet output needs pyarrow: pip install pyarrow")
+        self.dir = path
+        self.headers = headers
+        self.prefix = f"part-{int(time.time())}-{os.getpid()}"
+        self.seq = 0
+        ensure_dir(path)
+
+    def write(self, rows: Sequence[Dict]):
+        import pandas as pd
+        df = pd.DataFrame([{h: r.get(h) for h in self.headers} for r in rows], columns=self.headers)
+        for col in self.headers:
+            if col in NORMALIZED_NUMERIC:
+                df[col] = pd.to_numeric(df[col], errors="coerce").astype("float64")
+            else:
+                df[col] = df[col].map(lambda v: None if v is None else str(v)).astype("string")
+        self.seq += 1
+        final = os.path.join(self.dir, f"{self.prefix}-{self.seq:05d}.parquet")
+        tmp = final + ".tmp"
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, final)
+
+    def close(self):
+        pass
+
+
+class OutputWriter:
+    """Writes one run's products, documents and normalized rows.
+
+    Owned by the run (no module-level paths), so several jobs can write to
+    different directories in one process. Rows are buffered per table and
+    flushed every `batch_size` rows, every `flush_interval` seconds and on
+    close. `formats` is any of "csv" (the default, same files as before),
+    "jsonl" and "parquet". Near-duplicate pages are listed in "aliases".
+    """
+
+    def __init__(self, output_dir: str = "output", formats: Sequence[str] = ("csv",), batch_size: int = 50,
+                 flush_interval: float = 5.0, fsync: bool = False):
+        self.output_dir = output_dir
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        ensure_dir(output_dir)
+        ensure_dir(os.path.join(output_dir, "files"))
+        self._sinks = {}
+        for table, headers in TABLES.items():
+            sinks = []
+            for fmt in formats:
+                if fmt == "csv":
+                    sinks.append(_LineSink(os.path.join(output_dir, f"{table}.csv"), headers, "csv", fsync))
+                elif fmt == "jsonl":
+                    sinks.append(_LineSink(os.path.join(output_dir, f"{table}.jsonl"), headers, "jsonl", fsync))
+                elif fmt == "parquet":
+                    sinks.append(_ParquetSink(os.path.join(output_dir, f"{table}.parquet"), headers))
+                else:
+                    raise ValueError(f"Unknown output format: {fmt}")
+            self._sinks[table] = sinks
+        self._buffers = {table: [] for table in TABLES}
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._closed = threading.Event()
+        self._timer = None
+        if flush_interval and flush_interval > 0:
+            self._timer = threading.Thread(target=self._flush_periodically, daemon=True)
+            self._timer.start()
+
+    def write(self, table: str, row: Dict):
+        with self._lock:
+            buf = self._buffers[table]
+            buf.append(row)
+            if len(buf) >= self.batch_size:
+                self._flush_table(table)
+
+    def write_product(self, row: Dict):
+        self.write("products", row)
+
+    def write_document(self, row: Dict):
+        self.write("documents", row)
+
+    def write_normalized(self, row: Dict):
+        self.write("normalized_products", row)
+
+    def write_alias(self, row: Dict):
+        self.write("aliases", row)
+
+    def _flush_table(self, table: str):
+        rows = self._buffers[table]
+        if not rows:
+            return
+        self._buffers[table] = []
+        with METRICS.timer("write"):
+            for sink in self._sinks[table]:
+                sink.write(rows)
+        METRICS.inc("rows_written", len(rows), table=table)
 
+    def flush(self):
+        with self._lock:
+            for table in self._buffers:
+                self._flush_table(table)
+            self._last_flush = time.monotonic()
 
-def append_row(path: str, row: Dict):
-    with open(path, "a", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=list(row.keys()))
-        writer.writerow(row)
+    def _flush_periodically(self):
+        while not self._closed.wait(self.flush_interval):
+            self.flush()
 
+    def close(self):
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self.flush()
+        with self._lock:
+            for sinks in self._sinks.values():
+                for sink in sinks:
+                    sink.close()
 
-def append_normalized(row: dict):
-    with open(NORMALIZED_CSV, "a", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=NORMALIZED_HEADERS)
-        writer.writerow(row)
+    def __enter__(self):
+        return self
 
+    def __exit__(self, *exc):
+        self.close()
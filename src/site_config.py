@@ -1,5 +1,9 @@
-from pydantic import BaseModel
-from typing import List
+from cssselect import SelectorError, parse
+from pydantic import BaseModel, field_validator
+from typing import List, Literal, Optional
+
+RENDER_PROFILES = ("light", "full")
+
 
 class SiteConfig(BaseModel):
     manufacturer: str
@@ -9,4 +13,19 @@ class SiteConfig(BaseModel):
     deny_patterns: List[str] = []
     pdf_keywords: List[str] = []
     max_depth: int = 2
+    # Browser render profile: "light" (block images/media/fonts/trackers, wait for DOMContentLoaded
+    # and wait_selector) or "full" (wait for the load event); None uses RENDER_PROFILE
+    render_profile: Optional[Literal["light", "full"]] = None
+    # CSS selector that marks a rendered page in the light profile (default: product links, tables, PDFs)
+    wait_selector: Optional[str] = None
 
+    @field_validator("wait_selector")
+    @classmethod
+    def _check_selector(cls, v: Optional[str]) -> Optional[str]:
+        if v is None:
+            return v
+        try:
+            parse(v)
+        except SelectorError as e:
+            raise ValueError(f"invalid CSS selector {v!r}: {e}")
+        return v
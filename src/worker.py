@@ -0,0 +1,208 @@
+"""Long-lived crawl worker: runs jobs posted over local HTTP without per-job cold start.
+
+    python -m src.worker [--port 8787] [--max-jobs 2]
+
+POST /jobs with a JSON body ({"url", "manufacturer"} or {"seed": {...SiteConfig...}},
+plus optional "limit", "output_dir", "default_product_type", "concurrency",
+"fetch", "format", "frontier", "resume", "incremental") answers with an NDJSON
+stream: the job's --progress-json lines, then one final line whose status is
+"completed" or "error". GET /health reports readiness and running jobs.
+
+Chromium, the PDF extraction processes, the unit registry and alias maps, the
+robots.txt parsers and pooled HTTP connections stay warm between jobs. Up to
+`--max-jobs` jobs crawl at once; later ones wait (status "queued").
+"""
+import argparse
+import asyncio
+import json
+import os
+import queue
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from tqdm import tqdm
+
+from . import crawl as c
+from .normalizer import normalize_specs
+from .site_config import SiteConfig
+
+WORKER_HOST = os.getenv("WORKER_HOST", "127.0.0.1")
+WORKER_PORT = int(os.getenv("WORKER_PORT", "8787"))
+WORKER_MAX_JOBS = int(os.getenv("WORKER_MAX_JOBS", "2"))
+
+_DONE = object()
+
+
+class Worker:
+    """Owns the event loop, the shared browser and the shared crawl resources."""
+
+    def __init__(self, max_jobs: int = WORKER_MAX_JOBS, max_in_flight: int = c.BATCH_MAX_IN_FLIGHT,
+                 warm_browser: bool = c.FETCH_MODE != "http"):
+        self.max_jobs = max(1, max_jobs)
+        self.max_in_flight = max(1, max_in_flight)
+        self.started = time.monotonic()
+        self.running = 0
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self._thread.start()
+        self.shared = c._Shared()
+        asyncio.run_coroutine_threadsafe(self._setup(warm_browser), self.loop).result()
+
+    async def _setup(self, warm_browser: bool):
+        self.loop.set_default_executor(ThreadPoolExecutor(max_workers=self.max_in_flight + 4))
+        self.browser = c._Browser()
+        self.gate = asyncio.Semaphore(self.max_in_flight)
+        self.slots = asyncio.Semaphore(self.max_jobs)
+        # everything a cold `python -m src.crawl` pays before its first page
+        await asyncio.to_thread(normalize_specs, {}, "rtu")
+        await asyncio.to_thread(self.shared.pdf_stage.warm)
+        if warm_browser:
+            try:
+                await self.browser.start()
+            except Exception as e:
+                first_line = str(e).splitlines()[0] if str(e) else type(e).__name__
+                tqdm.write(f"Browser not started ({first_line}); browser jobs will retry on demand")
+
+    def submit(self, job: dict, emit):
+        """Schedule `job` on the loop; `emit` receives progress dicts and finally `_DONE`."""
+        return asyncio.run_coroutine_threadsafe(self._run(job, emit), self.loop)
+
+    async def _run(self, job: dict, emit):
+        try:
+            cfg = job_config(job)
+            job_id = job.get("id") or uuid.uuid4().hex
+            output_dir = job.get("output_dir") or os.path.join(c.OUTPUT_DIR, "jobs", job_id)
+            incremental = bool(job.get("incremental"))
+            if self.slots.locked():
+                emit({"status": "queued", "manufacturer": cfg.manufacturer,
+                      "message": "Waiting for a free worker slot"})
+            async with self.slots:
+                self.running += 1
+                crawl = None
+                completed = False
+                try:
+                    crawl = await asyncio.to_thread(
+                        c._open_crawl, cfg, int(job.get("limit", 50)), job.get("default_product_type"),
+                        output_dir, True, job.get("fetch"), job.get("format"), job.get("frontier"),
+                        bool(job.get("resume")), incremental, self.shared,
+                    )
+                    crawl.emit = emit
+                    await c._site(crawl, self.browser, max(1, int(job.get("concurrency") or c.CONCURRENCY)),
+                                  self.gate)
+                    completed = True
+                finally:
+                    self.running -= 1
+                    if crawl is not None:
+                        await asyncio.to_thread(c._close_crawl, crawl, completed, incremental)
+            emit({"status": "completed", "manufacturer": cfg.manufacturer, "progress": 100,
+                  "message": "Scraping completed successfully!", "currentProduct": crawl.saved,
+                  "seconds": round(crawl.elapsed, 2), "outputDir": output_dir})
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            traceback.print_exc()
+            emit({"status": "error", "message": f"{type(e).__name__}: {e}"})
+        finally:
+            emit(_DONE)
+
+    def close(self):
+        async def shutdown():
+            await self.browser.close()
+            self.shared.browser_peak_rss = self.browser.peak_rss
+
+        asyncio.run_coroutine_threadsafe(shutdown(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.shared.close()
+
+
+def job_config(job: dict) -> SiteConfig:
+    if job.get("seed"):
+        return SiteConfig(**job["seed"])
+    if job.get("url") and job.get("manufacturer"):
+        return c.site_from_url(job["url"], job["manufacturer"])
+    raise ValueError("A job needs either seed or url and manufacturer")
+
+
+def make_handler(worker: Worker):
+    class Handler(BaseHTTPRequestHandler):
+        # HTTP/1.0: the stream ends when the connection closes, no chunked encoding needed
+        protocol_version = "HTTP/1.0"
+
+        def _json(self, status: int, data: dict):
+            body = json.dumps(data).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path.rstrip("/") == "/health":
+                self._json(200, {"status": "ok", "jobs": worker.running,
+                                 "uptime": round(time.monotonic() - worker.started, 1)})
+            else:
+                self._json(404, {"error": "not found"})
+
+        def do_POST(self):
+            if self.path.rstrip("/") != "/jobs":
+                return self._json(404, {"error": "not found"})
+            try:
+                job = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+                job_config(job)
+            except Exception as e:
+                return self._json(400, {"error": str(e)})
+
+            lines = queue.Queue()
+            fut = worker.submit(job, lines.put)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            try:
+                while True:
+                    item = lines.get()
+                    if item is _DONE:
+                        break
+                    self.wfile.write(json.dumps(item).encode("utf-8") + b"\n")
+                    self.wfile.flush()
+            except OSError:
+                # the client went away: stop the crawl, its checkpoint allows "resume" later
+                fut.cancel()
+
+        def log_message(self, fmt, *args):
+            tqdm.write(f"worker: {fmt % args}")
+
+    return Handler
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--host", default=WORKER_HOST)
+    ap.add_argument("--port", type=int, default=WORKER_PORT)
+    ap.add_argument("--max-jobs", type=int, default=WORKER_MAX_JOBS, help="Jobs crawling at once")
+    ap.add_argument("--max-in-flight", type=int, default=c.BATCH_MAX_IN_FLIGHT,
+                    help="Pages fetched at once across all jobs")
+    args = ap.parse_args()
+
+    t = time.monotonic()
+    worker = Worker(args.max_jobs, args.max_in_flight)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(worker))
+    server.daemon_threads = True
+    tqdm.write(f"Worker ready in {time.monotonic() - t:.1f}s on http://{args.host}:{args.port} "
+               f"(up to {worker.max_jobs} jobs at once)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        worker.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -20,7 +20,7 @@ export async function GET(
     const zip = new JSZip()
     
     // Add CSV files
-    const csvFiles = ['products.csv', 'documents.csv', 'normalized_products.csv']
+    const csvFiles = ['products.csv', 'documents.csv', 'normalized_products.csv', 'aliases.csv']
     for (const csvFile of csvFiles) {
       const csvPath = path.join(outputDir, csvFile)
       if (fs.existsSync(csvPath)) {
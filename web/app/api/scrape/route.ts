@@ -32,6 +32,13 @@ export async function POST(request: NextRequest) {
       outputDir
     })
 
+    // A warm worker (python -m src.worker) skips the per-job Python/Chromium start-up
+    const workerUrl = process.env.SCRAPER_WORKER_URL
+    if (workerUrl) {
+      runOnWorker(workerUrl, jobId, { url, manufacturer, limit: limit || 50, output_dir: outputDir })
+      return NextResponse.json({ jobId })
+    }
+
     // Start Python scraper
     const pythonPath = process.env.PYTHON_PATH || '/Users/ofeksuchard/load55-productimporter/.venv/bin/python'
     // const scraperPath = path.join(process.env.SCRAPER_ROOT || '/Users/ofeksuchard/load55-productimporter', 'src')
@@ -97,3 +104,46 @@ export async function POST(request: NextRequest) {
   }
 }
 
+
+// Streams the worker's NDJSON progress lines into the job, like the spawned scraper's stdout
+async function runOnWorker(workerUrl: string, jobId: string, body: Record<string, unknown>) {
+  const update = (fields: object) => {
+    const job = jobs.get(jobId)
+    if (job) jobs.set(jobId, { ...job, ...fields })
+  }
+  try {
+    const res = await fetch(`${workerUrl.replace(/\/$/, '')}/jobs`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify(body)
+    })
+    if (!res.ok || !res.body) {
+      update({ status: 'error', message: 'Scraping failed' })
+      return
+    }
+    const reader = res.body.getReader()
+    const decoder = new TextDecoder()
+    let buffered = ''
+    for (;;) {
+      const { done, value } = await reader.read()
+      if (done) break
+      buffered += decoder.decode(value, { stream: true })
+      const lines = buffered.split('\n')
+      buffered = lines.pop() || ''
+      for (const line of lines) {
+        if (!line.trim()) continue
+        try {
+          update(JSON.parse(line))
+        } catch {
+          // Ignore malformed lines
+        }
+      }
+    }
+    if (jobs.get(jobId)?.status !== 'completed') {
+      update({ status: 'error', message: 'Scraping failed' })
+    }
+  } catch (error) {
+    console.error(`Scraper worker error: ${error}`)
+    update({ status: 'error', message: 'Scraping failed' })
+  }
+}